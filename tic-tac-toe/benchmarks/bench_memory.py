@@ -0,0 +1,60 @@
+"""
+Measure the peak and retained memory of complete searches from the empty
+board with tracemalloc, with and without interning the game states. The
+retained memory is what's still allocated once the search has returned.
+
+    (venv) $ python benchmarks/bench_memory.py
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+from tic_tac_toe.logic.minimax import (
+    find_best_move,
+    find_best_move_alphabeta,
+    transposition_table,
+)
+from tic_tac_toe.logic.models import GameState, Grid, game_state_pool
+
+POOL_SIZE = game_state_pool.maxsize
+
+def walk_tree(game_state: GameState) -> None:
+    stack = [game_state]
+    while stack:
+        stack.extend(move.after_state for move in stack.pop().possible_moves)
+
+SEARCHES: list[tuple[str, Callable[[GameState], object], str, int | None]] = [
+    ("minimax", find_best_move, " " * 9, POOL_SIZE),
+    ("alphabeta", find_best_move_alphabeta, " " * 9, POOL_SIZE),
+    ("alphabeta, no pool", find_best_move_alphabeta, " " * 9, 0),
+    ("tree walk after X, no pool", walk_tree, "X        ", 0),
+]
+
+def measure(
+    search: Callable[[GameState], object], cells: str, pool_size: int | None
+) -> tuple[float, float, float]:
+    transposition_table.clear()
+    game_state_pool.clear()
+    game_state_pool.maxsize = pool_size
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        search(GameState(Grid(cells)))
+        elapsed = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        game_state_pool.maxsize = POOL_SIZE
+    return peak / 1024, retained / 1024, elapsed
+
+def main() -> None:
+    print(f"{'search':<28}{'peak KiB':>12}{'retained KiB':>14}{'seconds':>10}")
+    for name, search, cells, pool_size in SEARCHES:
+        peak, retained, elapsed = measure(search, cells, pool_size)
+        print(f"{name:<28}{peak:>12,.0f}{retained:>14,.0f}{elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    main()
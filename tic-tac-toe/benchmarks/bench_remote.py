@@ -0,0 +1,49 @@
+"""
+Measure how batching amortizes the round trips to an external engine,
+by sending the same positions to the reference engine in batches of
+different sizes. The engine's search cache is warmed up first, so the
+numbers mostly reflect the cost of the protocol itself.
+
+    (venv) $ python benchmarks/bench_remote.py
+"""
+
+import random
+import time
+
+from tic_tac_toe.game.remote import RemoteEngine
+from tic_tac_toe.logic.models import GameState, Grid
+
+POSITIONS = 1024
+BATCH_SIZES = (1, 8, 64, 256)
+
+def random_positions(count: int) -> list[GameState]:
+    random.seed(0)
+    game_states = []
+    while len(game_states) < count:
+        game_state = GameState(Grid())
+        for _ in range(random.randrange(1, 8)):
+            if game_state.game_over:
+                break
+            game_state = game_state.make_random_move().after_state
+        if not game_state.game_over:
+            game_states.append(game_state)
+    return game_states
+
+def main() -> None:
+    game_states = random_positions(POSITIONS)
+    with RemoteEngine.spawn(timeout=None) as engine:
+        engine.request(game_states)
+        for batch_size in BATCH_SIZES:
+            start = time.perf_counter()
+            for offset in range(0, POSITIONS, batch_size):
+                engine.request(game_states[offset:offset + batch_size])
+            elapsed = time.perf_counter() - start
+            print(
+                f"batches of {batch_size:>3}: "
+                f"{POSITIONS / elapsed:>10,.0f} positions/sec, "
+                f"{elapsed / POSITIONS * 1e6:>8.1f} µs per position"
+            )
+        print(engine.metrics.summary())
+
+if __name__ == "__main__":
+    main()
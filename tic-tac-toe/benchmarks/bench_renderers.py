@@ -0,0 +1,60 @@
+"""
+Compare the number of bytes that the console renderers write to the
+terminal per game, which is what a slow SSH link or a recorded terminal
+session has to carry, between the full redraw and the incremental one.
+
+    (venv) $ PYTHONPATH=frontends python benchmarks/bench_renderers.py
+"""
+
+import io
+import random
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.models import CLASSIC, Geometry, Mark
+
+from console.renderers import ConsoleRenderer, IncrementalConsoleRenderer
+
+GAMES = 1000
+GEOMETRIES = (CLASSIC, Geometry(15, 15, 5))
+
+"""
+count the bytes in UTF-8, since the box-drawing characters of the grid
+take three bytes each
+"""
+class ByteCounter(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.bytes = self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode("utf-8"))
+        self.writes += 1
+        return len(text)
+
+def measure(renderer_class: type[Renderer], geometry: Geometry) -> tuple[float, float]:
+    random.seed(0)
+    stream = ByteCounter()
+    game = TicTacToe(
+        RandomComputerPlayer(Mark("X"), delay_seconds=0),
+        RandomComputerPlayer(Mark("O"), delay_seconds=0),
+        renderer_class(stream),
+    )
+    for _ in range(GAMES):
+        game.play(geometry=geometry)
+    return stream.bytes / GAMES, stream.writes / GAMES
+
+def main() -> None:
+    for geometry in GEOMETRIES:
+        print(f"{geometry.rows}x{geometry.columns}, {geometry.win_length} in a row:")
+        full, _ = measure(ConsoleRenderer, geometry)
+        for renderer_class in (ConsoleRenderer, IncrementalConsoleRenderer):
+            size, writes = measure(renderer_class, geometry)
+            print(
+                f"{renderer_class.__name__:>28}: {size:>10,.0f} bytes per game, "
+                f"{writes:.1f} writes, {size / full:.1%}"
+            )
+
+if __name__ == "__main__":
+    main()
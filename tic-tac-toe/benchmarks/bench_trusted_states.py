@@ -0,0 +1,41 @@
+"""
+Compare the cost of building a child game state through the public,
+validating constructors against the trusted path used by Move.after_state.
+
+    (venv) $ python benchmarks/bench_trusted_states.py
+"""
+
+import timeit
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+CELLS = "XO X O   "
+INDEX = 2
+NUMBER = 100_000
+
+def validated() -> GameState:
+    return GameState(Grid(CELLS[:INDEX] + "X" + CELLS[INDEX + 1:]), Mark.CROSS)
+
+def trusted() -> GameState:
+    return GameState._trusted(
+        Grid._trusted(CELLS[:INDEX] + "X" + CELLS[INDEX + 1:]), Mark.CROSS
+    )
+
+def expand_tree() -> int:
+    nodes, stack = 0, [GameState(Grid("X   O    "))]
+    while stack:
+        game_state = stack.pop()
+        nodes += 1
+        stack.extend(move.after_state for move in game_state.possible_moves)
+    return nodes
+
+def main() -> None:
+    for function in (validated, trusted):
+        seconds = min(timeit.repeat(function, number=NUMBER, repeat=5))
+        print(f"{function.__name__:>10}: {seconds / NUMBER * 1e6:.2f} µs per node")
+    nodes = expand_tree()
+    seconds = min(timeit.repeat(expand_tree, number=1, repeat=3))
+    print(f"subtree: {nodes} nodes, {seconds / nodes * 1e6:.2f} µs per node")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from .suite import Result, import_times, run_all, to_json
+
+BASELINES = Path(__file__).with_name("baselines")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tic-tac-toe engine.")
+    parser.add_argument("-k", dest="pattern", default="", help="run matching benchmarks only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="NAME", help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--importtime",
+        metavar="MODULE",
+        help="list the slowest imports of a module instead, e.g. console.cli",
+    )
+    args = parser.parse_args()
+
+    if args.importtime:
+        report_imports(args.importtime)
+        return
+
+    results = run_all(args.pattern, args.repeat)
+    baseline = load_baseline(args.compare) if args.compare else {}
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        save_baseline(args.save, results)
+    if regressions:
+        sys.exit(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+
+def report(results: list[Result], baseline: dict, threshold: float) -> int:
+    regressions = 0
+    print(f"{'benchmark':<28}{'ops/sec':>14}{'nodes/sec':>14}{'peak KiB':>12}{'change':>10}")
+    for result in results:
+        nodes = f"{result.nodes_per_second:,.0f}" if result.nodes_per_second else "-"
+        line = (
+            f"{result.name:<28}{result.ops_per_second:>14,.1f}"
+            f"{nodes:>14}{result.peak_memory_kb:>12,.1f}"
+        )
+        if previous := baseline.get(result.name):
+            change = result.ops_per_second / previous["ops_per_second"] - 1
+            line += f"{change:>+10.1%}"
+            if change < -threshold:
+                regressions += 1
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+def report_imports(module: str, limit: int = 20) -> None:
+    print(f"{'module':<48}{'cumulative ms':>14}")
+    for name, cumulative in import_times(module)[:limit]:
+        print(f"{name:<48}{cumulative / 1000:>14.1f}")
+
+def load_baseline(name: str) -> dict:
+    return json.loads((BASELINES / f"{name}.json").read_text())["results"]
+
+def save_baseline(name: str, results: list[Result]) -> None:
+    BASELINES.mkdir(exist_ok=True)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": to_json(results),
+    }
+    path = BASELINES / f"{name}.json"
+    path.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"Saved baseline to {path}")
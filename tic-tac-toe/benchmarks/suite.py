@@ -0,0 +1,254 @@
+"""
+Reproducible benchmarks of the hot paths in the logic and game packages.
+
+Each benchmark is a function, which performs one operation and returns
+the number of search nodes it visited, or None when node counts don't
+apply. Caches are cleared before every repetition of a search, so the
+numbers reflect a cold start rather than a table lookup.
+"""
+
+import gc
+import io
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import MinimaxComputerPlayer, RandomComputerPlayer
+from tic_tac_toe.game.remote import shared_engine
+from tic_tac_toe.game.renderers import NullRenderer, Renderer
+from tic_tac_toe.logic.minimax import (
+    SearchStats,
+    find_best_move,
+    find_best_move_alphabeta,
+    transposition_table,
+)
+from tic_tac_toe.logic.models import GameState, Geometry, Grid, Mark, game_state_pool
+from tic_tac_toe.logic.retrograde import solve
+
+from .bench_remote import random_positions
+
+MIDGAME_CELLS = ("X   O    ", "XO  X    ", "X O  X O ")
+
+# the console frontend is launched in a fresh interpreter to measure startup
+PROJECT = Path(__file__).resolve().parents[1]
+PYTHONPATH = os.pathsep.join(
+    [str(PROJECT / "library" / "src"), str(PROJECT / "frontends")]
+    + [path for path in [os.environ.get("PYTHONPATH")] if path]
+)
+
+# while its renderers are measured in this one
+if str(PROJECT / "frontends") not in sys.path:
+    sys.path.append(str(PROJECT / "frontends"))
+
+from console.renderers import ConsoleRenderer, IncrementalConsoleRenderer
+
+REMOTE_POSITIONS = random_positions(64)
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    function: Callable[[], int | None]
+    number: int
+    cold: bool
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    ops_per_second: float
+    nodes_per_second: float | None
+    peak_memory_kb: float
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+def benchmark(name: str, number: int = 1, cold: bool = False):
+    def decorator(function: Callable[[], int | None]):
+        BENCHMARKS[name] = Benchmark(name, function, number, cold)
+        return function
+    return decorator
+
+def clear_caches() -> None:
+    transposition_table.clear()
+    game_state_pool.clear()
+
+@benchmark("grid.construct", number=10_000)
+def grid_construct() -> None:
+    Grid("XO X O   ")
+
+@benchmark("game_state.construct", number=10_000)
+def game_state_construct() -> None:
+    GameState(Grid("XO X O   "))
+
+@benchmark("game_state.winner", number=10_000)
+def game_state_winner() -> None:
+    GameState._trusted(Grid._trusted("XOXOXOX  "), Mark.CROSS).winner
+
+@benchmark("game_state.winning_cells", number=10_000)
+def game_state_winning_cells() -> None:
+    GameState._trusted(Grid._trusted("XOXOXOX  "), Mark.CROSS).winning_cells
+
+@benchmark("game_state.threats", number=10_000)
+def game_state_threats() -> None:
+    GameState._trusted(Grid._trusted("XO X O   "), Mark.CROSS).threats
+
+@benchmark("game_state.possible_moves", number=10_000)
+def game_state_possible_moves() -> None:
+    game_state = GameState._trusted(Grid._trusted("X   O    "), Mark.CROSS)
+    for move in game_state.possible_moves:
+        move.after_state
+
+# the path taken by Move.after_state, which skips the validation
+@benchmark("game_state.trusted", number=10_000)
+def game_state_trusted() -> None:
+    GameState._trusted(Grid._trusted("XOXX O   "), Mark.CROSS)
+
+@benchmark("minimax.empty", cold=True)
+def minimax_empty() -> int:
+    stats = SearchStats()
+    find_best_move(GameState(Grid()), stats)
+    return stats.nodes
+
+@benchmark("minimax.midgame", cold=True)
+def minimax_midgame() -> int:
+    stats = SearchStats()
+    for cells in MIDGAME_CELLS:
+        find_best_move(GameState(Grid(cells)), stats)
+    return stats.nodes
+
+@benchmark("alphabeta.empty", cold=True)
+def alphabeta_empty() -> int:
+    stats = SearchStats()
+    find_best_move_alphabeta(GameState(Grid()), stats)
+    return stats.nodes
+
+@benchmark("alphabeta.midgame", cold=True)
+def alphabeta_midgame() -> int:
+    stats = SearchStats()
+    for cells in MIDGAME_CELLS:
+        find_best_move_alphabeta(GameState(Grid(cells)), stats)
+    return stats.nodes
+
+# without interning, every game state of the search is a new object
+@benchmark("memory.alphabeta_no_pool", cold=True)
+def memory_alphabeta_no_pool() -> int:
+    maxsize, game_state_pool.maxsize = game_state_pool.maxsize, 0
+    try:
+        return alphabeta_empty()
+    finally:
+        game_state_pool.maxsize = maxsize
+
+# every legal position counts as one node, visited exactly once
+@benchmark("retrograde.classic")
+def retrograde_classic() -> int:
+    return len(solve())
+
+@benchmark("retrograde.3x4")
+def retrograde_3x4() -> int:
+    return len(solve(Geometry(3, 4, 3)))
+
+@benchmark("play.random_vs_random", number=100)
+def play_random_vs_random() -> None:
+    TicTacToe(
+        RandomComputerPlayer(Mark("X"), delay_seconds=0),
+        RandomComputerPlayer(Mark("O"), delay_seconds=0),
+        NullRenderer(),
+    ).play()
+
+@benchmark("play.minimax_vs_minimax", cold=True)
+def play_minimax_vs_minimax() -> None:
+    TicTacToe(
+        MinimaxComputerPlayer(Mark("X"), delay_seconds=0),
+        MinimaxComputerPlayer(Mark("O"), delay_seconds=0),
+        NullRenderer(),
+    ).play()
+
+def play_rendered(renderer: Renderer) -> None:
+    TicTacToe(
+        RandomComputerPlayer(Mark("X"), delay_seconds=0),
+        RandomComputerPlayer(Mark("O"), delay_seconds=0),
+        renderer,
+    ).play()
+
+@benchmark("render.console", number=100)
+def render_console() -> None:
+    play_rendered(ConsoleRenderer(io.StringIO()))
+
+@benchmark("render.incremental", number=100)
+def render_incremental() -> None:
+    play_rendered(IncrementalConsoleRenderer(io.StringIO()))
+
+# one batch to the reference engine, which stays warm between batches
+@benchmark("remote.batch", number=10)
+def remote_batch() -> int:
+    shared_engine(timeout=None).request(REMOTE_POSITIONS)
+    return len(REMOTE_POSITIONS)
+
+@benchmark("startup.console", number=5)
+def startup_console() -> None:
+    python("-c", "import console.cli")
+
+def python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        env=os.environ | {"PYTHONPATH": PYTHONPATH},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+"""
+The cumulative import time of each module, in microseconds, as reported
+by python -X importtime, sorted from the slowest to the fastest import.
+"""
+def import_times(module: str) -> list[tuple[str, int]]:
+    report = python("-X", "importtime", "-c", f"import {module}").stderr
+    times = []
+    for line in report.splitlines()[1:]:
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append((name.strip(), int(cumulative)))
+    return sorted(times, key=lambda item: -item[1])
+
+def run(benchmark: Benchmark, repeat: int = 5) -> Result:
+    best_time, nodes = float("inf"), None
+    for _ in range(repeat):
+        random.seed(0)
+        if benchmark.cold:
+            clear_caches()
+        gc.collect()
+        nodes = 0
+        start = time.perf_counter()
+        for _ in range(benchmark.number):
+            nodes += benchmark.function() or 0
+        best_time = min(best_time, time.perf_counter() - start)
+    random.seed(0)
+    clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(benchmark.number):
+            benchmark.function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(
+        benchmark.name,
+        benchmark.number / best_time,
+        nodes / best_time if nodes else None,
+        peak / 1024,
+    )
+
+def run_all(pattern: str = "", repeat: int = 5) -> list[Result]:
+    return [
+        run(benchmark, repeat)
+        for name, benchmark in BENCHMARKS.items()
+        if pattern in name
+    ]
+
+def to_json(results: list[Result]) -> dict[str, dict]:
+    return {result.name: asdict(result) for result in results}
@@ -1,10 +1,16 @@
 import argparse
+from functools import partial
 from typing import NamedTuple
 
-from tic_tac_toe.game.players import Player, RandomComputerPlayer, MinimaxComputerPlayer
-from tic_tac_toe.logic.models import Mark
-
-from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.players import (
+    Player,
+    RandomComputerPlayer,
+    MCTSComputerPlayer,
+    MinimaxComputerPlayer,
+    SolvedTablePlayer,
+    SubprocessPlayer,
+)
+from tic_tac_toe.logic.models import Geometry, Mark
 
 from .players import ConsolePlayer
 
@@ -12,15 +18,36 @@ PLAYER_CLASSES = {
     "human": ConsolePlayer,
     "random": RandomComputerPlayer,
     "minimax": MinimaxComputerPlayer,
+    "fastest": partial(MinimaxComputerPlayer, prefer_fastest=True),
+    "alphabeta": partial(MinimaxComputerPlayer, search="alphabeta"),
+    "iterative": partial(MinimaxComputerPlayer, search="iterative", time_budget=1.0),
+    "solved": SolvedTablePlayer,
+    "mcts": MCTSComputerPlayer,
+    "remote": partial(SubprocessPlayer, shared=True),
 }
 
+"""
+point the remote players at an engine listening on a local socket, such
+as python -m tic_tac_toe.game.remote --port 8766, instead of the engine
+started in a subprocess
+"""
+def with_engine_port(players: dict, port: int | None) -> dict:
+    if port is None:
+        return players
+    return players | {"remote": partial(SubprocessPlayer, port=port)}
+
 class Args(NamedTuple):
-    player1: Player
-    player2: Player
+    player1: Player | None
+    player2: Player | None
     starting_mark: Mark
+    geometry: Geometry
+    record: str | None
+    profile: bool
+    serve: bool
+    incremental: bool
 
 # def parse_args() -> tuple[Player, Player, Mark]:
-def parse_args() -> Args:
+def parse_args(argv: list[str] | None = None) -> Args:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-X",
@@ -42,13 +69,65 @@ def parse_args() -> Args:
         type=Mark,
         default="X",
     )
-    args = parser.parse_args()
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument(
+        "--win-length",
+        type=int,
+        default=3,
+        help="number of marks in a row needed to win",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="append the finished game to a file of game records",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print a report of timings, counters and a cProfile capture",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="play one game per line of standard input, which holds its options",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="redraw only the cells that changed instead of the whole screen",
+    )
+    parser.add_argument(
+        "--engine-port",
+        type=int,
+        help="let the remote players ask an engine on this local port",
+    )
+    args = parser.parse_args(argv)
+    players = with_engine_port(PLAYER_CLASSES, args.engine_port)
+
+    try:
+        geometry = Geometry(args.rows, args.columns, args.win_length)
+    except ValueError as ex:
+        parser.error(str(ex))
 
-    player1 = PLAYER_CLASSES[args.player_x](Mark("X"))
-    player2 = PLAYER_CLASSES[args.player_o](Mark("O"))
+    # every line served from standard input builds its own players
+    if args.serve:
+        player1 = player2 = None
+    else:
+        player1 = players[args.player_x](Mark("X"))
+        player2 = players[args.player_o](Mark("O"))
 
     if args.starting_mark == "O":
         player1, player2 = player2, player1
 
     # return player1, player2, args.starting_mark
-    return Args(player1, player2, args.starting_mark)
\ No newline at end of file
+    return Args(
+        player1,
+        player2,
+        args.starting_mark,
+        geometry,
+        args.record,
+        args.profile,
+        args.serve,
+        args.incremental,
+    )
\ No newline at end of file
@@ -1,8 +1,49 @@
 from tic_tac_toe.game.engine import TicTacToe
 
 from .args import parse_args
-from .renderers import ConsoleRenderer
+from .renderers import ConsoleRenderer, IncrementalConsoleRenderer
 
 def main() -> None:
-    player1, player2, starting_mark = parse_args()
-    TicTacToe(player1, player2, ConsoleRenderer()).play(starting_mark)
\ No newline at end of file
+    (
+        player1,
+        player2,
+        starting_mark,
+        geometry,
+        record,
+        profile,
+        serve_stdin,
+        incremental,
+    ) = parse_args()
+    # the records, the profiler and the serve loop load only when asked for
+    if record:
+        from tic_tac_toe.game.records import GameRecordWriter
+        recorder = GameRecordWriter(record)
+    else:
+        recorder = None
+    if profile:
+        from tic_tac_toe.logic.instrumentation import Instrumentation
+        session = Instrumentation(profile=True)
+    else:
+        session = None
+    try:
+        if session:
+            session.enable()
+        if serve_stdin:
+            from .serve import serve
+            serve(recorder)
+        else:
+            renderer = (
+                IncrementalConsoleRenderer() if incremental else ConsoleRenderer()
+            )
+            TicTacToe(player1, player2, renderer, recorder=recorder).play(
+                starting_mark, geometry
+            )
+    finally:
+        if session:
+            session.disable()
+            session.report()
+        if recorder:
+            recorder.close()
+        for player in (player1, player2):
+            if player:
+                player.close()
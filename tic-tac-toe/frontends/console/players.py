@@ -1,15 +1,15 @@
-import re
-
 from tic_tac_toe.game.players import Player
 from tic_tac_toe.logic.exceptions import InvalidMove
-from tic_tac_toe.logic.models import GameState, Move
+from tic_tac_toe.logic.models import CLASSIC, GameState, Geometry, Move
 
 class ConsolePlayer(Player):
     # implement the abstract .get_move() method in the Player class
     def get_move(self, game_state: GameState) -> Move | None:
         while not game_state.game_over:
             try:
-                index = grid_to_index(input(f"{self.mark}'s move: ").strip())
+                index = grid_to_index(
+                    input(f"{self.mark}'s move: ").strip(), game_state.grid.geometry
+                )
             except ValueError:
                 print("Please provide coordinates in the form of A1 or 1A")
             else:
@@ -21,11 +21,17 @@ class ConsolePlayer(Player):
     
 # human player types cell coordinates like A1 or C3, you must convert such 
 # text to a numeric index with the help of the grid_to_index()
-def grid_to_index(grid: str) -> int:
-    if re.match(r"[abcABC][123]", grid):
-        col, row = grid
-    elif re.match(r"[123][abcABC]", grid):
-        row, col = grid
+# on larger grids, the row number may have more digits, e.g., B12 or 12B
+def grid_to_index(grid: str, geometry: Geometry = CLASSIC) -> int:
+    if grid[:1].isalpha():
+        col, row = grid[0], grid[1:]
+    elif grid[-1:].isalpha():
+        row, col = grid[:-1], grid[-1]
     else:
         raise ValueError("Invalid grid coordinates")
-    return 3 * (int(row) - 1) + (ord(col.upper()) - ord("A"))
\ No newline at end of file
+    if not (row.isdecimal() and col.isascii()):
+        raise ValueError("Invalid grid coordinates")
+    row_index, col_index = int(row) - 1, ord(col.upper()) - ord("A")
+    if not (0 <= row_index < geometry.rows and 0 <= col_index < geometry.columns):
+        raise ValueError("Invalid grid coordinates")
+    return geometry.columns * row_index + col_index
\ No newline at end of file
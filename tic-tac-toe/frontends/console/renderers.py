@@ -1,27 +1,87 @@
-import textwrap
-from typing import Iterable
+import sys
+from typing import Iterable, TextIO
 
 from tic_tac_toe.game.renderers import Renderer
-from tic_tac_toe.logic.models import GameState
+from tic_tac_toe.logic.models import CLASSIC, GameState, Geometry
+
+CLEAR_SCREEN = "\033c"
+CLEAR_BELOW = "\033[J"
 
 """
-ConsoleRenderer class overrides .render(), the only abstract 
-method responsible for visualizing the game’s current state
+ConsoleRenderer class overrides .render(), the only abstract
+method responsible for visualizing the game’s current state.
+Each frame is assembled in memory and sent with a single write.
 """
 class ConsoleRenderer(Renderer):
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
     def render(self, game_state: GameState) -> None:
-        clear_screen()
-        print_solid(game_state.grid.cells)
+        geometry = game_state.grid.geometry
         if game_state.winner:
-            print_blinking(game_state.grid.cells, game_state.winning_cells)
-            print(f"{game_state.winner} wins \N{party popper}")
+            grid = format_blinking(
+                game_state.grid.cells, game_state.winning_cells, geometry
+            )
+        else:
+            grid = format_grid(list(game_state.grid.cells), geometry)
+        write(self.stream, CLEAR_SCREEN + grid + "\n" + status(game_state))
+
+"""
+Keeps the last frame on the screen and moves the cursor straight to the
+cells that changed since then, which takes a few bytes per move instead
+of the whole board, and doesn't flicker. The screen is cleared only for
+the first frame or when the size of the grid changes. Everything below
+the grid is rewritten every time, which also erases the prompts and
+error messages left by the human players.
+"""
+class IncrementalConsoleRenderer(Renderer):
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+        self.cells: str | None = None
+        self.geometry: Geometry | None = None
+
+    def render(self, game_state: GameState) -> None:
+        cells, geometry = game_state.grid.cells, game_state.grid.geometry
+        frame = []
+        if self.cells is None or geometry != self.geometry:
+            frame.append(CLEAR_SCREEN + format_grid(list(cells), geometry))
         else:
-            print_solid(game_state.grid.cells)
-            if game_state.tie:
-                print("No one wins this time \N{neutral face}")
+            for index, (before, after) in enumerate(zip(self.cells, cells)):
+                if before != after:
+                    frame.append(move_cursor(*cell_position(index, geometry)) + after)
+        for index in game_state.winning_cells if game_state.winner else ():
+            frame.append(
+                move_cursor(*cell_position(index, geometry)) + blink(cells[index])
+            )
+        frame.append(move_cursor(2 * geometry.rows + 3, 1) + CLEAR_BELOW)
+        frame.append(status(game_state))
+        write(self.stream, "".join(frame))
+        self.cells, self.geometry = cells, geometry
 
-def clear_screen() -> None:
-    print("\033c", end="")
+def move_cursor(row: int, column: int) -> str:
+    return f"\033[{row};{column}H"
+
+"""
+the one-based row and column of a cell on the screen, which follow the
+layout of format_grid(): two lines of column labels come before the
+first row, and every row is followed by a separator line
+"""
+def cell_position(index: int, geometry: Geometry = CLASSIC) -> tuple[int, int]:
+    row, column = divmod(index, geometry.columns)
+    return 3 + 2 * row, len(str(geometry.rows)) + 5 + 4 * column
+
+def status(game_state: GameState) -> str:
+    if game_state.winner:
+        return f"{game_state.winner.value} wins \N{party popper}\n"
+    if game_state.tie:
+        return "No one wins this time \N{neutral face}\n"
+    return ""
+
+# the stream defaults to whatever sys.stdout is at the time of writing
+def write(stream: TextIO | None, text: str) -> None:
+    stream = stream or sys.stdout
+    stream.write(text)
+    stream.flush()
 
 """
 distinguish the winner's winning marks with blinking text
@@ -29,23 +89,32 @@ distinguish the winner's winning marks with blinking text
 def blink(text: str) -> str:
     return f"\033[5m{text}\033[0m"
 
-def print_blinking(cells: Iterable[str], positions: Iterable[int]) -> None:
+def format_blinking(
+    cells: Iterable[str], positions: Iterable[int], geometry: Geometry = CLASSIC
+) -> str:
     mutable_cells = list(cells)
     for position in positions:
         mutable_cells[position] = blink(mutable_cells[position])
-    print_solid(mutable_cells)
-
-def print_solid(cells: Iterable[str]) -> None:
-    print(
-        textwrap.dedent(
-            """\
-             A   B   C
-           ------------
-        1 ┆  {0} │ {1} │ {2}
-          ┆ ───┼───┼───
-        2 ┆  {3} │ {4} │ {5}
-          ┆ ───┼───┼───
-        3 ┆  {6} │ {7} │ {8}
-    """
-        ).format(*cells)
-    )
\ No newline at end of file
+    return format_grid(mutable_cells, geometry)
+
+"""
+lay out the cells in rows labeled with numbers and columns labeled with
+letters, widening the row labels when there are more than nine rows
+"""
+def format_grid(cells: list[str], geometry: Geometry = CLASSIC) -> str:
+    width = len(str(geometry.rows))
+    letters = [chr(ord("A") + column) for column in range(geometry.columns)]
+    lines = [
+        " " * (width + 4) + "   ".join(letters),
+        " " * (width + 2) + "-" * 4 * geometry.columns,
+    ]
+    separator = " " * width + " ┆ " + "┼".join(["───"] * geometry.columns)
+    for row in range(geometry.rows):
+        if row > 0:
+            lines.append(separator)
+        start = row * geometry.columns
+        lines.append(
+            f"{row + 1:>{width}} ┆  "
+            + " │ ".join(cells[start:start + geometry.columns])
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,59 @@
+"""
+A warm process for scripted matches, which plays one game per line of
+standard input without paying the startup cost of Python again. Every
+line holds the same options as the command line, for example:
+
+    -X minimax -O random --starting O
+    -X mcts -O alphabeta --rows 4 --columns 4
+
+The games are played headless, without delays, and the outcome of each
+one is written to standard output as a JSON document on a single line.
+The search caches stay warm from one game to the next.
+"""
+
+import json
+import shlex
+import sys
+from typing import TextIO
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import ComputerPlayer
+from tic_tac_toe.game.records import GameRecordWriter
+from tic_tac_toe.game.renderers import NullRenderer
+
+from .args import parse_args
+
+def serve(
+    recorder: GameRecordWriter | None = None,
+    stdin: TextIO = sys.stdin,
+    stdout: TextIO = sys.stdout,
+) -> None:
+    for number, line in enumerate(stdin, start=1):
+        if not line.strip():
+            continue
+        try:
+            result = play(shlex.split(line), recorder)
+        except SystemExit:  # argparse has already explained the error on stderr
+            result = {"error": "Invalid options"}
+        except ValueError as ex:
+            result = {"error": str(ex)}
+        print(json.dumps({"game": number} | result), file=stdout, flush=True)
+
+def play(argv: list[str], recorder: GameRecordWriter | None) -> dict:
+    args = parse_args(argv)
+    if args.serve:
+        raise ValueError("Already serving games from standard input")
+    player1, player2 = args.player1, args.player2
+    # raise inside the block, so that both players get closed either way
+    with player1, player2:
+        for player in (player1, player2):
+            if not isinstance(player, ComputerPlayer):
+                raise ValueError("Only computer players can play without a keyboard")
+            player.delay_seconds = 0
+        game = TicTacToe(player1, player2, NullRenderer(), recorder=recorder)
+        game_state = game.play(args.starting_mark, args.geometry)
+    return {
+        "cells": game_state.grid.cells,
+        "winner": game_state.winner,
+        "tie": game_state.tie,
+    }
@@ -0,0 +1,54 @@
+import argparse
+
+from tic_tac_toe.game.selfplay import play_batch
+from tic_tac_toe.logic.models import Geometry, Mark
+
+from console.args import PLAYER_CLASSES, with_engine_port
+
+# only the computer players can play without anyone at the keyboard
+COMPUTER_PLAYERS = {
+    name: factory for name, factory in PLAYER_CLASSES.items() if name != "human"
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Play many headless games between two computer players."
+    )
+    parser.add_argument(
+        "-X", dest="player_x", choices=COMPUTER_PLAYERS.keys(), default="random"
+    )
+    parser.add_argument(
+        "-O", dest="player_o", choices=COMPUTER_PLAYERS.keys(), default="minimax"
+    )
+    parser.add_argument(
+        "--starting", dest="starting_mark", choices=Mark, type=Mark, default="X"
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--engine-port", type=int, default=None)
+    args = parser.parse_args()
+    players = with_engine_port(COMPUTER_PLAYERS, args.engine_port)
+
+    try:
+        geometry = Geometry(args.rows, args.columns, args.win_length)
+    except ValueError as ex:
+        parser.error(str(ex))
+
+    result = play_batch(
+        players[args.player_x],
+        players[args.player_o],
+        args.games,
+        args.starting_mark,
+        args.workers,
+        args.seed,
+        geometry,
+    )
+    print(f"X ({args.player_x}) wins: {result.x_wins}")
+    print(f"O ({args.player_o}) wins: {result.o_wins}")
+    print(f"Ties: {result.ties}")
+    print(f"{result.games} games in {result.elapsed:.2f}s "
+          f"({result.games_per_second:.1f} games/sec)")
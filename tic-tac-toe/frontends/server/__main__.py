@@ -0,0 +1,3 @@
+from .cli import main
+
+main()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+
+from tic_tac_toe.game.async_engine import SessionManager
+
+from console.args import PLAYER_CLASSES, with_engine_port
+
+# remote clients play against one of the computer players
+COMPUTER_PLAYERS = {
+    name: factory for name, factory in PLAYER_CLASSES.items() if name != "human"
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Host concurrent games for clients connecting over TCP."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "-O", dest="opponent", choices=COMPUTER_PLAYERS.keys(), default="minimax"
+    )
+    parser.add_argument("--max-sessions", type=int, default=None)
+    parser.add_argument("--engine-port", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+async def serve(args: argparse.Namespace) -> None:
+    manager = SessionManager(args.max_sessions)
+    players = with_engine_port(COMPUTER_PLAYERS, args.engine_port)
+    server = await manager.serve(players[args.opponent], args.host, args.port)
+    for sock in server.sockets:
+        print("Listening on {}:{}".format(*sock.getsockname()[:2]))
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,89 @@
+import argparse
+
+from tic_tac_toe.game.tournament import FORMATS, PairingResult, Tournament
+from tic_tac_toe.logic.models import Geometry
+
+from console.args import PLAYER_CLASSES, with_engine_port
+
+# only the computer players can play without anyone at the keyboard
+COMPUTER_PLAYERS = {
+    name: factory for name, factory in PLAYER_CLASSES.items() if name != "human"
+}
+DEFAULT_PLAYERS = ["random", "minimax", "alphabeta"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rank computer players in a tournament with Elo ratings."
+    )
+    parser.add_argument(
+        "players",
+        nargs="*",
+        help=(
+            f"any of {', '.join(COMPUTER_PLAYERS)}, or "
+            f"{', '.join(DEFAULT_PLAYERS)} when none are given"
+        ),
+    )
+    parser.add_argument("--format", choices=FORMATS, default="round-robin")
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--engine-port", type=int, default=None)
+    args = parser.parse_args()
+    # argparse can't check the choices of an empty list, so it's done here
+    for name in args.players:
+        if name not in COMPUTER_PLAYERS:
+            parser.error(f"argument players: invalid choice: {name!r}")
+    if not args.players:
+        args.players = DEFAULT_PLAYERS
+    players = with_engine_port(COMPUTER_PLAYERS, args.engine_port)
+
+    try:
+        geometry = Geometry(args.rows, args.columns, args.win_length)
+        tournament = Tournament(
+            {name: players[name] for name in args.players},
+            args.games,
+            args.format,
+            args.rounds,
+            args.workers,
+            args.seed,
+            geometry,
+            args.checkpoint,
+        )
+        result = tournament.run(print_pairing)
+    except ValueError as ex:
+        parser.error(str(ex))
+    except KeyboardInterrupt:
+        if args.checkpoint:
+            print(f"Interrupted, run again with --checkpoint {args.checkpoint} to resume")
+        return
+
+    print(f"\n{'player':<12}{'elo':>8}{'95% interval':>18}{'games':>8}{'score':>8}")
+    for rating in result.ratings():
+        interval = f"{rating.lower:.0f} to {rating.upper:.0f}"
+        print(
+            f"{rating.player:<12}{rating.elo:>8.0f}{interval:>18}"
+            f"{rating.games:>8}{rating.score:>8.1%}"
+        )
+
+    print(f"\n{'pairing':<26}{'games':>8}{'seconds':>10}{'games/sec':>12}")
+    for pairing in result.pairings:
+        name = f"{pairing.player_a} vs {pairing.player_b}"
+        print(
+            f"{name:<26}{pairing.games:>8}{pairing.elapsed:>10.2f}"
+            f"{pairing.games_per_second:>12.1f}"
+        )
+    if result.resumed_games:
+        print(f"{result.resumed_games} games resumed from {args.checkpoint}")
+    print(f"{result.played_games} games in {result.elapsed:.2f}s "
+          f"({result.games_per_second:.1f} games/sec)")
+
+def print_pairing(pairing: PairingResult) -> None:
+    print(
+        f"round {pairing.round}: {pairing.player_a} {pairing.a_wins} - "
+        f"{pairing.b_wins} {pairing.player_b} ({pairing.ties} ties)"
+    )
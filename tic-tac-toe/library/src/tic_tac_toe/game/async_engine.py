@@ -0,0 +1,258 @@
+"""
+An asyncio flavor of the game engine, which lets a single process host
+thousands of games at the same time. Players and renderers are awaited
+instead of called, artificial delays don't block the event loop, and
+computer players search for their moves in an executor, so a slow search
+doesn't stall the other games.
+
+The SessionManager runs games side by side, either entirely in-process
+or with one of the players connected over a stream, such as a local TCP
+socket. The stream protocol exchanges JSON documents, one per line:
+
+    server → client: {"cells": "X  O     ", "rows": 3, "columns": 3,
+                      "win_length": 3, "mark": "X"}
+    client → server: 4
+    server → client: {"cells": "...", "winner": "X", "tie": false}
+"""
+
+import abc
+import asyncio
+import itertools
+import json
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeAlias
+
+from tic_tac_toe.game.players import ComputerPlayer
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.models import CLASSIC, GameState, Geometry, Grid, Mark, Move
+from tic_tac_toe.logic.validators import validate_players
+
+AsyncErrorHandler: TypeAlias = Callable[[Exception], Awaitable[None]]
+
+class AsyncPlayer(metaclass=abc.ABCMeta):
+    def __init__(self, mark: Mark) -> None:
+        self.mark = mark
+
+    async def make_move(self, game_state: GameState) -> GameState:
+        if self.mark is game_state.current_mark:
+            if move := await self.get_move(game_state):
+                return move.after_state
+            raise InvalidMove("No more possible moves")
+        else:
+            raise InvalidMove("It's the other player's turn")
+
+    @abc.abstractmethod
+    async def get_move(self, game_state: GameState) -> Move | None:
+        """Return the current player's move in the given game state."""
+
+"""
+Adapts any synchronous computer player to the async protocol. The delay
+is awaited rather than slept, and the search itself runs in the given
+executor, or the event loop's default thread pool, where the searches of
+concurrent games share the module-level caches, which are thread-safe.
+"""
+class AsyncComputerPlayer(AsyncPlayer):
+    def __init__(
+        self, player: ComputerPlayer, executor: Executor | None = None
+    ) -> None:
+        super().__init__(player.mark)
+        self.player = player
+        self.executor = executor
+
+    async def get_move(self, game_state: GameState) -> Move | None:
+        if self.player.delay_seconds > 0:
+            await asyncio.sleep(self.player.delay_seconds)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.player.get_computer_move, game_state
+        )
+
+"""
+A player on the other end of a stream, who receives the game state as
+a JSON document and answers with the index of the cell to mark.
+"""
+class StreamPlayer(AsyncPlayer):
+    def __init__(
+        self, mark: Mark, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        super().__init__(mark)
+        self.reader = reader
+        self.writer = writer
+
+    async def get_move(self, game_state: GameState) -> Move | None:
+        while not game_state.game_over:
+            await send(self.writer, state_to_json(game_state) | {"mark": self.mark})
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Player disconnected")
+            try:
+                index = int(line)
+            except ValueError:
+                await send(self.writer, {"error": "Expected a cell index"})
+                continue
+            if not 0 <= index < game_state.grid.geometry.size:
+                await send(self.writer, {"error": "Cell is out of range"})
+                continue
+            try:
+                return game_state.make_move_to(index)
+            except InvalidMove as ex:
+                await send(self.writer, {"error": str(ex) or "Invalid move"})
+        return None
+
+class AsyncRenderer(metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    async def render(self, game_state: GameState) -> None:
+        """Render the current game state."""
+
+class AsyncNullRenderer(AsyncRenderer):
+    async def render(self, game_state: GameState) -> None:
+        pass
+
+"""
+sends the final position to the remote player once the game is over
+"""
+class StreamRenderer(AsyncRenderer):
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+
+    async def render(self, game_state: GameState) -> None:
+        if game_state.game_over:
+            await send(self.writer, state_to_json(game_state))
+
+@dataclass(frozen=True)
+class AsyncTicTacToe:
+    player1: AsyncPlayer
+    player2: AsyncPlayer
+    renderer: AsyncRenderer
+
+    error_handler: AsyncErrorHandler | None = None
+
+    def __post_init__(self):
+        validate_players(self.player1, self.player2)
+
+    async def play(
+        self, starting_mark: Mark = Mark("X"), geometry: Geometry = CLASSIC
+    ) -> GameState:
+        game_state = GameState(Grid.blank(geometry), starting_mark)
+        while True:
+            await self.renderer.render(game_state)
+            if game_state.game_over:
+                return game_state
+            player = self.get_current_player(game_state)
+            try:
+                game_state = await player.make_move(game_state)
+            except InvalidMove as ex:
+                if self.error_handler:
+                    await self.error_handler(ex)
+
+    def get_current_player(self, game_state: GameState) -> AsyncPlayer:
+        if game_state.current_mark is self.player1.mark:
+            return self.player1
+        else:
+            return self.player2
+
+@dataclass
+class Session:
+    id: int
+    game: AsyncTicTacToe
+    task: "asyncio.Task[GameState]"
+
+"""
+Keeps track of the games running concurrently on one event loop. The
+optional limit caps the number of games in progress, while the rest
+wait for their turn.
+"""
+class SessionManager:
+    def __init__(self, max_sessions: int | None = None) -> None:
+        self.max_sessions = max_sessions
+        self.sessions: dict[int, Session] = {}
+        self._ids = itertools.count()
+        self._slots: asyncio.Semaphore | None = None
+
+    def start(
+        self,
+        game: AsyncTicTacToe,
+        starting_mark: Mark = Mark("X"),
+        geometry: Geometry = CLASSIC,
+    ) -> Session:
+        session_id = next(self._ids)
+        task = asyncio.create_task(self._run(session_id, game, starting_mark, geometry))
+        session = self.sessions[session_id] = Session(session_id, game, task)
+        return session
+
+    async def run(
+        self,
+        games: list[AsyncTicTacToe],
+        starting_mark: Mark = Mark("X"),
+        geometry: Geometry = CLASSIC,
+    ) -> list[GameState]:
+        sessions = [self.start(game, starting_mark, geometry) for game in games]
+        return await asyncio.gather(*(session.task for session in sessions))
+
+    @property
+    def active(self) -> int:
+        return len(self.sessions)
+
+    async def _run(
+        self,
+        session_id: int,
+        game: AsyncTicTacToe,
+        starting_mark: Mark,
+        geometry: Geometry,
+    ) -> GameState:
+        if self.max_sessions is not None and self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_sessions)
+        try:
+            if self._slots is None:
+                return await game.play(starting_mark, geometry)
+            async with self._slots:
+                return await game.play(starting_mark, geometry)
+        finally:
+            del self.sessions[session_id]
+
+    """
+    Accept connections on a local socket, where every client plays one
+    game as X against the opponent made by the factory, which is then
+    wrapped so that it moves in the executor.
+    """
+    async def serve(
+        self,
+        opponent: Callable[[Mark], ComputerPlayer],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        starting_mark: Mark = Mark("X"),
+        geometry: Geometry = CLASSIC,
+        executor: Executor | None = None,
+    ) -> asyncio.Server:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            computer = opponent(Mark("O"))
+            game = AsyncTicTacToe(
+                StreamPlayer(Mark("X"), reader, writer),
+                AsyncComputerPlayer(computer, executor),
+                StreamRenderer(writer),
+            )
+            try:
+                await self.start(game, starting_mark, geometry).task
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+                computer.close()
+        return await asyncio.start_server(handle, host, port)
+
+def state_to_json(game_state: GameState) -> dict:
+    document = {
+        "cells": game_state.grid.cells,
+        "rows": game_state.grid.geometry.rows,
+        "columns": game_state.grid.geometry.columns,
+        "win_length": game_state.grid.geometry.win_length,
+    }
+    if game_state.game_over:
+        document["winner"] = game_state.winner
+        document["tie"] = game_state.tie
+    return document
+
+async def send(writer: asyncio.StreamWriter, document: dict) -> None:
+    writer.write(json.dumps(document).encode("utf-8") + b"\n")
+    await writer.drain()
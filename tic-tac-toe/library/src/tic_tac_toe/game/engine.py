@@ -1,14 +1,20 @@
+import time
 from dataclasses import dataclass
 
 from tic_tac_toe.game.players import Player
 from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic import instrumentation
 from tic_tac_toe.logic.exceptions import InvalidMove
-from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.models import CLASSIC, GameState, Geometry, Grid, Mark
 from tic_tac_toe.logic.validators import validate_players
 
-from typing import Callable, TypeAlias
+from typing import TYPE_CHECKING, Callable, TypeAlias
 ErrorHandler: TypeAlias = Callable[[Exception], None]
 
+# only the games that are recorded load the file format
+if TYPE_CHECKING:
+    from tic_tac_toe.game.records import GameRecordWriter
+
 @dataclass(frozen=True)
 class TicTacToe:
     player1: Player
@@ -16,27 +22,45 @@ class TicTacToe:
     renderer: Renderer
 
     error_handler: ErrorHandler | None = None
+    recorder: "GameRecordWriter | None" = None
 
     # validate the players’ marks when instantiating the TicTacToe class
     def __post_init__(self):
         validate_players(self.player1, self.player2)
 
-    def play(self, starting_mark: Mark = Mark("X")) -> None:
-        game_state = GameState(Grid(), starting_mark)
+    def play(
+        self, starting_mark: Mark = Mark("X"), geometry: Geometry = CLASSIC
+    ) -> GameState:
+        game_state = GameState(Grid.blank(geometry), starting_mark)
+        if self.recorder:
+            self.recorder.begin(game_state, *self.get_player_names())
         while True:
             self.renderer.render(game_state)
             if game_state.game_over:
-                break # until the game is over
+                if self.recorder:
+                    self.recorder.end(game_state)
+                return game_state # until the game is over
             player = self.get_current_player(game_state)
+            start = time.perf_counter() if instrumentation.active else 0.0
             try:
                 game_state = player.make_move(game_state)
             except InvalidMove as ex:
                 if self.error_handler:
                     self.error_handler(ex)
+            else:
+                if instrumentation.active:
+                    instrumentation.emit("engine.move", time.perf_counter() - start)
+                if self.recorder:
+                    self.recorder.record(game_state)
 
     # map the current mark to a player object 
     def get_current_player(self, game_state: GameState) -> Player:
         if game_state.current_mark is self.player1.mark:
             return self.player1
         else:
-            return self.player2
\ No newline at end of file
+            return self.player2
+
+    # names of the players using crosses and naughts, respectively
+    def get_player_names(self) -> tuple[str, str]:
+        players = sorted((self.player1, self.player2), key=lambda p: p.mark != "X")
+        return tuple(type(player).__name__ for player in players)
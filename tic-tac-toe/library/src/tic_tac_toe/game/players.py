@@ -1,10 +1,22 @@
 import abc
 import time
 import random
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from tic_tac_toe.logic import instrumentation
 from tic_tac_toe.logic.models import Mark, GameState, Move
-from tic_tac_toe.logic.exceptions import InvalidMove
-from tic_tac_toe.logic.minimax import find_best_move
+from tic_tac_toe.logic.exceptions import EngineError, InvalidMove
+from tic_tac_toe.logic.heuristics import Evaluator, open_lines
+
+"""
+The search modules are imported by the players that need them, when
+they're created, so that a game between humans, or a short-lived
+process, doesn't pay for loading the artificial intelligence.
+"""
+if TYPE_CHECKING:
+    from tic_tac_toe.game.remote import RemoteEngine
+    from tic_tac_toe.logic.minimax import SearchStats
 
 """
 An abstract class is one that you can’t instantiate because its objects 
@@ -17,7 +29,15 @@ class Player(metaclass=abc.ABCMeta):
 
     def make_move(self, game_state: GameState) -> GameState:
         if self.mark is game_state.current_mark:
-            if move := self.get_move(game_state):
+            if instrumentation.active is None:
+                move = self.get_move(game_state)
+            else:
+                start = time.perf_counter()
+                move = self.get_move(game_state)
+                instrumentation.emit(
+                    f"{type(self).__name__}.get_move", time.perf_counter() - start
+                )
+            if move:
                 return move.after_state
             raise InvalidMove("No more possible moves")
         else:
@@ -27,6 +47,19 @@ class Player(metaclass=abc.ABCMeta):
     def get_move(self, game_state: GameState) -> Move | None:
         """Return the current player's move in the given game state."""
 
+    """
+    release the resources held by the player, such as worker processes,
+    once it has played its last game
+    """
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Player":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 """
 extends Player by adding an additional member, .delay_seconds, 
 to its instances, which by default is equal to 250 milliseconds. 
@@ -37,7 +70,8 @@ class ComputerPlayer(Player, metaclass=abc.ABCMeta):
         self.delay_seconds = delay_seconds
 
     def get_move(self, game_state: GameState) -> Move | None:
-        time.sleep(self.delay_seconds)
+        if self.delay_seconds > 0:
+            time.sleep(self.delay_seconds)
         return self.get_computer_move(game_state)
 
     @abc.abstractmethod
@@ -55,14 +89,186 @@ class RandomComputerPlayer(ComputerPlayer):
         #     return None
         return game_state.make_random_move()
         
+# names of the search functions in the minimax module
+SEARCH_ALGORITHMS = {
+    "minimax": "find_best_move",
+    "alphabeta": "find_best_move_alphabeta",
+    "iterative": "find_best_move_iterative",
+}
+
 """
 This computer player will always try to find the best tic-tac-toe 
-move with AI and Python. 
+move with AI and Python. The statistics of the most recent search are
+kept in .last_search_stats, so you can compare the search algorithms.
+
+The "iterative" search respects the optional time and node budgets,
+and scores unfinished games with the evaluator once it reaches them,
+so it can bound the time it takes to move on boards of any size. The
+plain "minimax" search can split the moves across several worker
+processes instead, which are kept for the lifetime of the player. With
+.prefer_fastest set, the "minimax" search also tells apart the moves of
+equal outcome, picking the fastest win or, failing that, the slowest loss.
 """
 class MinimaxComputerPlayer(ComputerPlayer):
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        search: str = "minimax",
+        time_budget: float | None = None,
+        node_budget: int | None = None,
+        evaluator: Evaluator = open_lines,
+        workers: int = 1,
+        prefer_fastest: bool = False,
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        if search not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {search}")
+        if search != "iterative" and (time_budget or node_budget):
+            raise ValueError("Only the iterative search accepts a budget")
+        if search != "minimax" and workers != 1:
+            raise ValueError("Only the minimax search runs on several workers")
+        if prefer_fastest and (search != "minimax" or workers != 1):
+            raise ValueError("Only the sequential minimax search prefers fast wins")
+        from tic_tac_toe.logic import minimax
+        self.search = search
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.evaluator = evaluator
+        self.find_best_move = getattr(minimax, SEARCH_ALGORITHMS[search])
+        if prefer_fastest:
+            from tic_tac_toe.logic.analysis import find_fastest_move
+            self.find_best_move = find_fastest_move
+        self.parallel = minimax.ParallelSearch(workers) if workers != 1 else None
+        self.last_search_stats: "SearchStats | None" = None
+
+    def close(self) -> None:
+        if self.parallel is not None:
+            self.parallel.close()
+
     def get_computer_move(self, game_state: GameState) -> Move | None:
         # return find_best_move(game_state)
         if game_state.game_not_started:
             return game_state.make_random_move()
         else:
-            return find_best_move(game_state)
\ No newline at end of file
+            from tic_tac_toe.logic.minimax import SearchStats
+            self.last_search_stats = stats = SearchStats()
+            if self.search == "iterative":
+                move = self.find_best_move(
+                    game_state,
+                    stats,
+                    self.time_budget,
+                    self.node_budget,
+                    self.evaluator,
+                )
+            elif self.parallel is not None:
+                move = self.parallel.find_best_move(game_state, stats)
+            else:
+                move = self.find_best_move(game_state, stats)
+            if instrumentation.active is not None:
+                instrumentation.emit("search.nodes", stats.nodes)
+                instrumentation.emit("search.cutoffs", stats.cutoffs)
+                instrumentation.emit("search.elapsed", stats.elapsed)
+            return move
+
+"""
+Plays perfectly without searching at all, by looking up the best move
+in a precomputed table of every legal position. The memory-mapped table
+is opened once per process and shared by all instances.
+"""
+class SolvedTablePlayer(ComputerPlayer):
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        path: Path | str | None = None,
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.minimax import find_best_move
+        from tic_tac_toe.logic.solved_table import DEFAULT_PATH, load_table
+        self.table = load_table(path or DEFAULT_PATH)
+        self.find_best_move = find_best_move
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        if move := self.table.best_move(game_state):
+            return move
+        return self.find_best_move(game_state)
+
+
+"""
+Estimates the best move from the outcomes of random playouts, within a
+budget of iterations or seconds per move. The playouts of every leaf
+can run on a pool of worker processes, and the search tree is reused
+across the moves of one game.
+"""
+class MCTSComputerPlayer(ComputerPlayer):
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        iterations: int | None = 2000,
+        time_budget: float | None = None,
+        workers: int = 1,
+        rollouts_per_leaf: int = 1,
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.mcts import MonteCarloTreeSearch
+        self.search = MonteCarloTreeSearch(
+            iterations,
+            time_budget,
+            rollouts_per_leaf=rollouts_per_leaf,
+            workers=workers,
+        )
+
+    def close(self) -> None:
+        self.search.close()
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return self.search.find_best_move(game_state)
+
+"""
+Asks an external engine for its moves, by default a reference engine
+started in a subprocess for this player alone, which .close() stops.
+Players can also share one RemoteEngine, which batches the positions of
+the games that they play at the same time. Either pass the engine, or
+set .shared to use the one engine per process started with the given
+command, or give the port of an engine listening on a local socket.
+When the engine doesn't answer within the timeout, or fails to answer,
+the player makes a random move instead, unless .fallback is turned off.
+"""
+class SubprocessPlayer(ComputerPlayer):
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        engine: "RemoteEngine | None" = None,
+        command: list[str] | None = None,
+        timeout: float | None = 5.0,
+        fallback: bool = True,
+        shared: bool = False,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.game import remote
+        self.owns_engine = engine is None and not shared and port is None
+        if self.owns_engine:
+            engine = remote.RemoteEngine.spawn(
+                command or remote.REFERENCE_ENGINE, timeout=timeout
+            )
+        elif engine is None:
+            engine = remote.shared_engine(command, host, port, timeout)
+        self.engine = engine
+        self.fallback = fallback
+
+    def close(self) -> None:
+        if self.owns_engine:
+            self.engine.close()
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        try:
+            return self.engine.get_move(game_state)
+        except EngineError:
+            if self.fallback:
+                return game_state.make_random_move()
+            raise
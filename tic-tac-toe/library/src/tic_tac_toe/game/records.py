@@ -0,0 +1,224 @@
+"""
+A compact binary format for recording finished games, so that you can
+persist and replay them later. A file starts with a short header, which
+is followed by any number of game records:
+
+    file header:   magic (4s) | version (B)
+    record header: flags (B) | rows (B) | columns (B) | win length (B) |
+                   X name length (B) | O name length (B) | move count (B)
+    record body:   X name | O name | one byte per move (the cell index)
+
+The lowest bit of the flags tells whether naughts started the game. The
+writer appends one record per game, as the engine reports each move, and
+the readers either stream the records one at a time or memory-map the
+file for random access by game index.
+"""
+
+import mmap
+import struct
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from tic_tac_toe.logic.models import GameState, Geometry, Grid, Mark
+
+MAGIC = b"TTTR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB")
+RECORD_HEADER = struct.Struct("<7B")
+NAUGHT_STARTS = 0x01
+
+@dataclass(frozen=True)
+class GameRecord:
+    starting_mark: Mark
+    geometry: Geometry
+    player_x: str
+    player_o: str
+    moves: bytes
+
+    """
+    yield the game states one after another, starting from an empty grid
+    """
+    def replay(self) -> Iterator[GameState]:
+        game_state = GameState(Grid.blank(self.geometry), self.starting_mark)
+        yield game_state
+        for index in self.moves:
+            game_state = game_state.make_move_to(index).after_state
+            yield game_state
+
+    @property
+    def final_state(self) -> GameState:
+        for game_state in self.replay():
+            pass
+        return game_state
+
+    def to_bytes(self) -> bytes:
+        player_x = _encode_name(self.player_x)
+        player_o = _encode_name(self.player_o)
+        return (
+            RECORD_HEADER.pack(
+                NAUGHT_STARTS if self.starting_mark is Mark.NAUGHT else 0,
+                self.geometry.rows,
+                self.geometry.columns,
+                self.geometry.win_length,
+                len(player_x),
+                len(player_o),
+                len(self.moves),
+            )
+            + player_x
+            + player_o
+            + self.moves
+        )
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | mmap.mmap, offset: int) -> tuple["GameRecord", int]:
+        flags, rows, columns, win_length, x_length, o_length, count = (
+            RECORD_HEADER.unpack_from(buffer, offset)
+        )
+        offset += RECORD_HEADER.size
+        player_x = bytes(buffer[offset:offset + x_length]).decode("utf-8")
+        offset += x_length
+        player_o = bytes(buffer[offset:offset + o_length]).decode("utf-8")
+        offset += o_length
+        moves = bytes(buffer[offset:offset + count])
+        record = cls(
+            Mark.NAUGHT if flags & NAUGHT_STARTS else Mark.CROSS,
+            Geometry(rows, columns, win_length),
+            player_x,
+            player_o,
+            moves,
+        )
+        return record, offset + count
+
+"""
+Collects the moves of the game in progress and appends its record to
+the file once the game is over. Pass it to the TicTacToe engine as the
+recorder to save every game played.
+"""
+class GameRecordWriter:
+    def __init__(self, path: Path | str) -> None:
+        # the writes always go to the end, but the header can be read first
+        self.file: BinaryIO = open(path, "a+b")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        else:
+            self.file.seek(0)
+            try:
+                _check_file_header(self.file.read(FILE_HEADER.size), path)
+            except ValueError:
+                self.file.close()
+                raise
+        self._game_state: GameState | None = None
+        self._names = ("", "")
+        self._moves = bytearray()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def write(self, record: GameRecord) -> None:
+        self.file.write(record.to_bytes())
+
+    def begin(self, game_state: GameState, player_x: str, player_o: str) -> None:
+        if game_state.grid.geometry.size > 255:
+            raise ValueError("Only grids of up to 255 cells can be recorded")
+        self._game_state = game_state
+        self._names = (player_x, player_o)
+        self._moves.clear()
+
+    """
+    the cell of the new mark is the only bit that differs between the
+    occupied cells of the previous and the current game state
+    """
+    def record(self, game_state: GameState) -> None:
+        if self._game_state is None:
+            raise RuntimeError("No game in progress")
+        before, after = self._game_state.grid.bitboard, game_state.grid.bitboard
+        changed = (before.crosses | before.naughts) ^ (after.crosses | after.naughts)
+        self._moves.append(changed.bit_length() - 1)
+        self._game_state = game_state
+
+    def end(self, game_state: GameState) -> None:
+        self.write(
+            GameRecord(
+                game_state.starting_mark,
+                game_state.grid.geometry,
+                *self._names,
+                bytes(self._moves),
+            )
+        )
+        self._game_state = None
+
+"""
+read the records one by one from a file object, which keeps the memory
+usage flat no matter how many games the file holds
+"""
+def iter_records(path: Path | str) -> Iterator[GameRecord]:
+    with open(path, "rb") as file:
+        _check_file_header(file.read(FILE_HEADER.size), path)
+        while header := file.read(RECORD_HEADER.size):
+            if len(header) < RECORD_HEADER.size:
+                raise ValueError(f"Truncated game record in {path}")
+            *_, x_length, o_length, count = RECORD_HEADER.unpack(header)
+            body = file.read(x_length + o_length + count)
+            if len(body) < x_length + o_length + count:
+                raise ValueError(f"Truncated game record in {path}")
+            record, _ = GameRecord.from_buffer(header + body, 0)
+            yield record
+
+"""
+Memory-maps a file of game records for random access by game index.
+The offsets of the records are found in a single pass over the record
+headers, which skips the names and moves without decoding them.
+"""
+class GameRecordReader:
+    def __init__(self, path: Path | str) -> None:
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_file_header(self._buffer[:FILE_HEADER.size], path)
+        self._offsets = array("Q")
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(self._buffer):
+            self._offsets.append(offset)
+            *_, x_length, o_length, count = RECORD_HEADER.unpack_from(self._buffer, offset)
+            offset += RECORD_HEADER.size + x_length + o_length + count
+        if offset != len(self._buffer):
+            self.close()
+            raise ValueError(f"Truncated game record in {path}")
+
+    def __enter__(self) -> "GameRecordReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        record, _ = GameRecord.from_buffer(self._buffer, self._offsets[index])
+        return record
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for offset in self._offsets:
+            yield GameRecord.from_buffer(self._buffer, offset)[0]
+
+"""
+names longer than a byte can count are cut, but only between characters,
+so that the record still decodes
+"""
+def _encode_name(name: str) -> bytes:
+    return name.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+
+def _check_file_header(header: bytes, path: Path | str) -> None:
+    if len(header) < FILE_HEADER.size or FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError(f"Not a file of game records: {path}")
@@ -0,0 +1,431 @@
+"""
+Let an external engine, such as another process, possibly written in
+another language, choose the moves of a player. The engine talks over a
+pair of text streams, either its standard input and output or a local
+socket, with one JSON document per line. Each request carries a batch of
+positions, which may come from many games played at the same time, so
+that the cost of a round trip is shared by all of them:
+
+    client → engine: {"id": 7, "positions": [
+                         {"cells": "X   O    ", "rows": 3, "columns": 3,
+                          "win_length": 3, "starting": "X"}, ...]}
+    engine → client: {"id": 7, "moves": [2, ...]}
+    engine → client: {"id": 7, "error": "Invalid position"}
+
+There's one move per position, in the same order, or null when the game
+is already over. Responses carry the id of their request, so the client
+can skip a late answer to a request that has already timed out.
+
+Run this module to start the reference engine, which answers with the
+minimax search on its standard input and output, or on a local socket:
+
+    $ python -m tic_tac_toe.game.remote --search alphabeta
+    $ python -m tic_tac_toe.game.remote --port 8766
+"""
+
+import atexit
+import itertools
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, TextIO
+
+from tic_tac_toe.logic import instrumentation
+from tic_tac_toe.logic.exceptions import EngineError, EngineTimeout
+from tic_tac_toe.logic.instrumentation import Histogram
+from tic_tac_toe.logic.models import GameState, Geometry, Grid, Mark, Move
+
+if TYPE_CHECKING:
+    import socketserver
+
+# the command line of the reference engine, which runs this very module
+REFERENCE_ENGINE = (sys.executable, "-m", "tic_tac_toe.game.remote")
+LIBRARY_PATH = Path(__file__).resolve().parents[2]
+
+def position_to_json(game_state: GameState) -> dict:
+    return {
+        "cells": game_state.grid.cells,
+        "rows": game_state.grid.geometry.rows,
+        "columns": game_state.grid.geometry.columns,
+        "win_length": game_state.grid.geometry.win_length,
+        "starting": game_state.starting_mark.value,
+    }
+
+def position_from_json(document: dict) -> GameState:
+    geometry = Geometry(
+        document["rows"], document["columns"], document["win_length"]
+    )
+    return GameState(Grid(document["cells"], geometry), Mark(document["starting"]))
+
+"""
+the latency of every request and the number of positions that it
+carried, along with the requests that failed or timed out
+"""
+class EngineMetrics:
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.batch_size = Histogram()
+        self.errors = 0
+        self.timeouts = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def positions(self) -> int:
+        return int(self.batch_size.total)
+
+    def summary(self) -> str:
+        text = (
+            f"{self.requests} requests, {self.positions} positions, "
+            f"{self.timeouts} timeouts, {self.errors} errors"
+        )
+        if self.requests:
+            text += (
+                f", latency mean {self.latency.mean * 1000:.2f} ms, "
+                f"p90 {self.latency.percentile(0.9) * 1000:.2f} ms, "
+                f"max {self.latency.max * 1000:.2f} ms"
+            )
+        return text
+
+"""
+A connection to an external engine, which can be shared by any number of
+players, including players of concurrent games running in other threads.
+
+Positions passed to .get_move() are queued, and only one caller at a
+time sends up to .max_batch of them as one request, while the others
+wait for their answers or their turn to send. The positions queued
+during a round trip go out together in the next request, which batches
+them under load without delaying a lone caller. Setting .max_delay makes
+the sender also wait up to that many seconds for a full batch.
+"""
+class RemoteEngine:
+    def __init__(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        timeout: float | None = 5.0,
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+        process: subprocess.Popen | None = None,
+        connection: socket.socket | None = None,
+    ) -> None:
+        self.writer = writer
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.process = process
+        self.connection = connection
+        self.metrics = EngineMetrics()
+        self._ids = itertools.count(1)
+        self._responses: queue.Queue[dict | None] = queue.Queue()
+        self._pending: list[tuple[GameState, Future]] = []
+        self._condition = threading.Condition()
+        self._sending = False
+        # reading in the background is what lets a request give up in time
+        threading.Thread(
+            target=self._read, args=(reader,), daemon=True, name="engine-reader"
+        ).start()
+
+    @classmethod
+    def spawn(
+        cls, command: list[str] | tuple[str, ...] = REFERENCE_ENGINE, **kwargs
+    ) -> "RemoteEngine":
+        environment = os.environ.copy()
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [str(LIBRARY_PATH)] + [p for p in [environment.get("PYTHONPATH")] if p]
+        )
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=environment,
+        )
+        return cls(process.stdout, process.stdin, process=process, **kwargs)
+
+    @classmethod
+    def connect(
+        cls, host: str = "127.0.0.1", port: int = 8766, **kwargs
+    ) -> "RemoteEngine":
+        connection = socket.create_connection((host, port))
+        stream = connection.makefile("rw", encoding="utf-8")
+        return cls(stream, stream, connection=connection, **kwargs)
+
+    def __enter__(self) -> "RemoteEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.connection is not None:
+            # wake the reader first, which holds the lock of the shared stream
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        try:
+            self.writer.close()
+        except OSError:
+            pass
+        if self.connection is not None:
+            self.connection.close()
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def get_move(self, game_state: GameState) -> Move | None:
+        future: Future[int | None] = Future()
+        with self._condition:
+            self._pending.append((game_state, future))
+            self._condition.notify_all()
+        while not future.done():
+            with self._condition:
+                if self._sending:
+                    self._condition.wait_for(lambda: future.done() or not self._sending)
+                    continue
+                self._sending = True
+                if self.max_delay > 0:
+                    self._condition.wait_for(
+                        lambda: len(self._pending) >= self.max_batch,
+                        timeout=self.max_delay,
+                    )
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            try:
+                self._answer(batch)
+            finally:
+                with self._condition:
+                    self._sending = False
+                    self._condition.notify_all()
+        index = future.result()
+        return None if index is None else game_state.make_move_to(index)
+
+    def _answer(self, batch: list[tuple[GameState, Future]]) -> None:
+        try:
+            moves = self.request([game_state for game_state, _ in batch])
+        except Exception as ex:
+            for _, future in batch:
+                future.set_exception(ex)
+        else:
+            for (_, future), index in zip(batch, moves):
+                future.set_result(index)
+
+    """
+    send one request with the given positions and wait for the answer,
+    returning the cell index of the move chosen in each position
+    """
+    def request(self, game_states: list[GameState]) -> list[int | None]:
+        request_id = next(self._ids)
+        document = {
+            "id": request_id,
+            "positions": [position_to_json(game_state) for game_state in game_states],
+        }
+        start = time.perf_counter()
+        deadline = None if self.timeout is None else start + self.timeout
+        try:
+            self.writer.write(json.dumps(document) + "\n")
+            self.writer.flush()
+        except OSError as ex:
+            self.metrics.errors += 1
+            raise EngineError(f"Engine is gone: {ex}") from ex
+        while True:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                response = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                self.metrics.timeouts += 1
+                raise EngineTimeout(f"No answer within {self.timeout}s") from None
+            if response is None:
+                self._responses.put(None)  # let the next request fail fast too
+                self.metrics.errors += 1
+                raise EngineError("Engine closed the connection")
+            if response.get("id") == request_id:
+                break
+        elapsed = time.perf_counter() - start
+        self.metrics.latency.add(elapsed)
+        self.metrics.batch_size.add(len(game_states))
+        if instrumentation.active is not None:
+            instrumentation.emit("remote.latency", elapsed)
+            instrumentation.emit("remote.batch_size", len(game_states))
+        moves = response.get("moves")
+        if not isinstance(moves, list) or len(moves) != len(game_states):
+            self.metrics.errors += 1
+            raise EngineError(response.get("error", "Malformed response"))
+        for game_state, index in zip(game_states, moves):
+            if not is_legal_answer(game_state, index):
+                self.metrics.errors += 1
+                raise EngineError(f"Illegal move from the engine: {index!r}")
+        return moves
+
+    def _read(self, reader: TextIO) -> None:
+        try:
+            for line in reader:
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    continue  # not a response, such as a stray diagnostic line
+                if isinstance(response, dict):
+                    self._responses.put(response)
+        except (OSError, ValueError):
+            pass
+        self._responses.put(None)
+
+# engines shared by the players of this process, see shared_engine()
+_shared_engines: dict[tuple, tuple[int, RemoteEngine]] = {}
+_shared_lock = threading.Lock()
+
+"""
+One engine per process for each command, or for each address of an
+engine listening on a socket, which all the players that ask for it
+share, so that their positions are batched together. The engines are
+closed when the process exits. A forked worker process doesn't inherit
+them, since their reader threads don't survive the fork.
+"""
+def shared_engine(
+    command: list[str] | tuple[str, ...] | None = None,
+    host: str = "127.0.0.1",
+    port: int | None = None,
+    timeout: float | None = 5.0,
+) -> RemoteEngine:
+    command = tuple(command or REFERENCE_ENGINE)
+    key = (command, timeout) if port is None else (host, port, timeout)
+    with _shared_lock:
+        pid, engine = _shared_engines.get(key, (None, None))
+        if engine is None or pid != os.getpid():
+            if port is None:
+                engine = RemoteEngine.spawn(command, timeout=timeout)
+            else:
+                engine = RemoteEngine.connect(host, port, timeout=timeout)
+            if not _shared_engines:
+                atexit.register(close_shared_engines)
+            _shared_engines[key] = (os.getpid(), engine)
+        return engine
+
+def close_shared_engines() -> None:
+    with _shared_lock:
+        for pid, engine in _shared_engines.values():
+            if pid == os.getpid():
+                engine.close()
+        _shared_engines.clear()
+
+"""
+the engine must answer null for a finished game, and otherwise the index
+of an empty cell, which JSON can't tell apart from a float or a boolean
+until it's checked here
+"""
+def is_legal_answer(game_state: GameState, index: object) -> bool:
+    if game_state.game_over:
+        return index is None
+    return (
+        type(index) is int
+        and 0 <= index < game_state.grid.geometry.size
+        and game_state.grid.cells[index] == " "
+    )
+
+"""
+Answer the requests read from one stream, such as standard input, until
+it ends. Invalid positions fail the whole request with an error message.
+"""
+def serve(
+    find_best_move: Callable[[GameState], Move | None],
+    reader: TextIO = sys.stdin,
+    writer: TextIO = sys.stdout,
+) -> None:
+    for line in reader:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            moves = []
+            for document in request["positions"]:
+                game_state = position_from_json(document)
+                move = None if game_state.game_over else find_best_move(game_state)
+                moves.append(None if move is None else move.cell_index)
+            response = {"id": request_id, "moves": moves}
+        except Exception as ex:
+            response = {"id": request_id, "error": str(ex) or type(ex).__name__}
+        writer.write(json.dumps(response) + "\n")
+        writer.flush()
+
+"""
+Answer every client connected to a local socket in a thread of its own.
+The searches are still serialized, one at a time, since they're CPU-bound
+and a find_best_move() from elsewhere may not be safe to call from
+several threads at once.
+"""
+def socket_server(
+    find_best_move: Callable[[GameState], Move | None],
+    host: str = "127.0.0.1",
+    port: int = 8766,
+) -> "socketserver.ThreadingTCPServer":
+    import socketserver
+
+    lock = threading.Lock()
+
+    def find_best_move_serialized(game_state: GameState) -> Move | None:
+        with lock:
+            return find_best_move(game_state)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            with self.connection.makefile("rw", encoding="utf-8") as stream:
+                serve(find_best_move_serialized, stream, stream)
+
+    return socketserver.ThreadingTCPServer((host, port), Handler)
+
+def serve_socket(
+    find_best_move: Callable[[GameState], Move | None],
+    host: str = "127.0.0.1",
+    port: int = 8766,
+) -> None:
+    with socket_server(find_best_move, host, port) as server:
+        print("Listening on {}:{}".format(*server.server_address), file=sys.stderr)
+        server.serve_forever()
+
+def main() -> None:
+    import argparse
+    from functools import partial
+    from tic_tac_toe.game.players import SEARCH_ALGORITHMS
+    from tic_tac_toe.logic import minimax
+
+    parser = argparse.ArgumentParser(
+        description="Answer the move requests of remote players with a search."
+    )
+    parser.add_argument(
+        "--search", choices=SEARCH_ALGORITHMS.keys(), default="minimax"
+    )
+    parser.add_argument("--time-budget", type=float, default=1.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
+    find_best_move = getattr(minimax, SEARCH_ALGORITHMS[args.search])
+    if args.search == "iterative":
+        find_best_move = partial(find_best_move, time_budget=args.time_budget)
+    try:
+        if args.port is None:
+            serve(find_best_move)
+        else:
+            serve_socket(find_best_move, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -12,4 +12,11 @@ handy at some point.
 class Renderer(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def render(self, game_state: GameState) -> None:
-        """Render the current game state."""
\ No newline at end of file
+        """Render the current game state."""
+
+"""
+draws nothing, which is useful for headless games played by computers
+"""
+class NullRenderer(Renderer):
+    def render(self, game_state: GameState) -> None:
+        pass
@@ -0,0 +1,123 @@
+"""
+Play many headless games between two computer players to evaluate them.
+The games are split into chunks, which run on a pool of worker processes
+without any rendering or artificial delays between the moves.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeAlias
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import ComputerPlayer, Player
+from tic_tac_toe.game.renderers import NullRenderer
+from tic_tac_toe.logic.models import CLASSIC, Geometry, Mark
+
+PlayerFactory: TypeAlias = Callable[[Mark], Player]
+
+@dataclass(frozen=True)
+class BatchResult:
+    games: int
+    x_wins: int
+    o_wins: int
+    ties: int
+    elapsed: float
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def __add__(self, other: "BatchResult") -> "BatchResult":
+        return BatchResult(
+            self.games + other.games,
+            self.x_wins + other.x_wins,
+            self.o_wins + other.o_wins,
+            self.ties + other.ties,
+            self.elapsed + other.elapsed,
+        )
+
+"""
+the player factories must be picklable, such as classes or partial
+functions, so that they can be sent over to the worker processes
+"""
+def play_batch(
+    player_x: PlayerFactory,
+    player_o: PlayerFactory,
+    games: int,
+    starting_mark: Mark = Mark("X"),
+    workers: int | None = None,
+    seed: int | None = None,
+    geometry: Geometry = CLASSIC,
+) -> BatchResult:
+    if games < 0:
+        raise ValueError("Number of games must not be negative")
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1 or games < 2:
+        result = play_chunk(player_x, player_o, games, starting_mark, seed, geometry)
+    else:
+        chunks = split(games, workers * 4)
+        seeds = [
+            None if seed is None else seed + index for index in range(len(chunks))
+        ]
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(
+                play_chunk,
+                [player_x] * len(chunks),
+                [player_o] * len(chunks),
+                chunks,
+                [starting_mark] * len(chunks),
+                seeds,
+                [geometry] * len(chunks),
+            )
+            result = sum(results, BatchResult(0, 0, 0, 0, 0.0))
+    return BatchResult(
+        result.games,
+        result.x_wins,
+        result.o_wins,
+        result.ties,
+        time.perf_counter() - start,
+    )
+
+"""
+Reseed the random number generator even without an explicit seed, or
+else the forked worker processes would all inherit the same sequence.
+"""
+def play_chunk(
+    player_x: PlayerFactory,
+    player_o: PlayerFactory,
+    games: int,
+    starting_mark: Mark = Mark("X"),
+    seed: int | None = None,
+    geometry: Geometry = CLASSIC,
+) -> BatchResult:
+    random.seed(seed)
+    player1 = make_headless(player_x, Mark("X"))
+    player2 = make_headless(player_o, Mark("O"))
+    game = TicTacToe(player1, player2, NullRenderer())
+    x_wins = o_wins = ties = 0
+    start = time.perf_counter()
+    with player1, player2:
+        for _ in range(games):
+            game_state = game.play(starting_mark, geometry)
+            if game_state.winner is Mark.CROSS:
+                x_wins += 1
+            elif game_state.winner is Mark.NAUGHT:
+                o_wins += 1
+            else:
+                ties += 1
+    return BatchResult(games, x_wins, o_wins, ties, time.perf_counter() - start)
+
+def make_headless(factory: PlayerFactory, mark: Mark) -> Player:
+    player = factory(mark)
+    if isinstance(player, ComputerPlayer):
+        player.delay_seconds = 0
+    return player
+
+def split(total: int, parts: int) -> list[int]:
+    quotient, remainder = divmod(total, parts)
+    sizes = [quotient + (i < remainder) for i in range(parts)]
+    return [size for size in sizes if size > 0]
@@ -0,0 +1,397 @@
+"""
+Rank many computer players by letting them play against each other,
+either in a round robin, where everyone meets everyone else, or in a
+Swiss system, where each round pairs up the players with similar scores.
+
+Every pairing is one job for a pool of worker processes, which plays all
+of its games headlessly. Both players take turns playing crosses, and
+the starting mark alternates too, so neither of them gets an advantage.
+The finished pairings are appended to an optional checkpoint file, one
+JSON document per line, which lets you interrupt a long tournament and
+resume it later without replaying the pairings that are already done:
+
+    {"tournament": {"players": [...], "games": 100, ...}}
+    {"player_a": "minimax", "player_b": "random", "a_wins": 87, ...}
+
+The ratings are fitted to all the games at once, rather than updated
+after each game, so they don't depend on the order in which the worker
+processes happened to finish the pairings.
+"""
+
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from tic_tac_toe.game.selfplay import PlayerFactory, play_chunk, split
+from tic_tac_toe.logic.models import CLASSIC, Geometry, Mark
+
+FORMATS = ("round-robin", "swiss")
+
+# ratings are reported on the usual chess scale
+ELO_SCALE = 400 / math.log(10)
+ELO_MEAN = 1500.0
+Z_95 = 1.959964
+
+@dataclass(frozen=True)
+class PairingResult:
+    player_a: str
+    player_b: str
+    a_wins: int
+    b_wins: int
+    ties: int
+    elapsed: float
+    round: int = 1
+
+    @property
+    def games(self) -> int:
+        return self.a_wins + self.b_wins + self.ties
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def players(self) -> tuple[str, str]:
+        return self.player_a, self.player_b
+
+"""
+the rating of a player along with its 95% confidence interval, and the
+points scored, counting a win as one point and a tie as half a point
+"""
+@dataclass(frozen=True)
+class Rating:
+    player: str
+    elo: float
+    lower: float
+    upper: float
+    games: int
+    points: float
+
+    @property
+    def score(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+"""
+All the pairings of a tournament, including the ones loaded from the
+checkpoint file, whose games don't count towards the throughput of the
+current run, which took .elapsed seconds of wall-clock time.
+"""
+@dataclass(frozen=True)
+class TournamentResult:
+    pairings: tuple[PairingResult, ...]
+    elapsed: float
+    resumed_games: int = 0
+
+    @property
+    def games(self) -> int:
+        return sum(pairing.games for pairing in self.pairings)
+
+    @property
+    def played_games(self) -> int:
+        return self.games - self.resumed_games
+
+    @property
+    def games_per_second(self) -> float:
+        return self.played_games / self.elapsed if self.elapsed else 0.0
+
+    def ratings(self) -> list[Rating]:
+        return fit_ratings(self.pairings)
+
+"""
+Plays the pairings of a tournament between the named player factories,
+which must be picklable to reach the worker processes. A Swiss tournament
+runs .rounds rounds, by default enough to single out a winner, and gives
+a bye to the lowest-ranked player left without an opponent.
+"""
+class Tournament:
+    def __init__(
+        self,
+        players: dict[str, PlayerFactory],
+        games: int = 100,
+        format: str = "round-robin",
+        rounds: int | None = None,
+        workers: int | None = None,
+        seed: int | None = None,
+        geometry: Geometry = CLASSIC,
+        checkpoint: Path | str | None = None,
+    ) -> None:
+        if len(players) < 2:
+            raise ValueError("A tournament needs at least two players")
+        if games < 1:
+            raise ValueError("Number of games must be positive")
+        if format not in FORMATS:
+            raise ValueError(f"Unknown tournament format: {format}")
+        if rounds is not None and rounds < 1:
+            raise ValueError("Number of rounds must be positive")
+        self.players = players
+        self.games = games
+        self.format = format
+        self.rounds = rounds or math.ceil(math.log2(len(players)))
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.geometry = geometry
+        self.checkpoint = None if checkpoint is None else Path(checkpoint)
+
+    """
+    the settings that must not change between the runs of a tournament
+    resumed from the same checkpoint file
+    """
+    @property
+    def settings(self) -> dict:
+        return {
+            "players": list(self.players),
+            "games": self.games,
+            "format": self.format,
+            "rounds": self.rounds if self.format == "swiss" else None,
+            "seed": self.seed,
+            "geometry": [
+                self.geometry.rows, self.geometry.columns, self.geometry.win_length
+            ],
+        }
+
+    def run(
+        self, progress: Callable[[PairingResult], None] | None = None
+    ) -> TournamentResult:
+        finished = self.load_checkpoint()
+        resumed_games = sum(pairing.games for pairing in finished.values())
+        start = time.perf_counter()
+        if self.format == "round-robin":
+            self._play(round_robin(list(self.players)), 1, finished, progress)
+        else:
+            for round in range(1, self.rounds + 1):
+                # only the earlier rounds count, even when resuming this one
+                earlier = [p for p in finished.values() if p.round < round]
+                standings = rank(self.players, earlier)
+                pairs = swiss_pairings(standings, [p.players for p in earlier])
+                if not pairs:
+                    break  # everyone has already met everyone else
+                self._play(pairs, round, finished, progress)
+        return TournamentResult(
+            tuple(finished.values()), time.perf_counter() - start, resumed_games
+        )
+
+    def load_checkpoint(self) -> dict[tuple[str, str], PairingResult]:
+        finished: dict[tuple[str, str], PairingResult] = {}
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return finished
+        data = self.checkpoint.read_bytes()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            # a run killed in the middle of a write leaves a partial line behind
+            with open(self.checkpoint, "r+b") as file:
+                file.truncate(len(complete))
+        lines = complete.decode("utf-8").splitlines()
+        if not lines:
+            return finished
+        header = json.loads(lines[0]).get("tournament")
+        if header != self.settings:
+            raise ValueError(
+                f"Checkpoint belongs to a different tournament: {self.checkpoint}"
+            )
+        for line in lines[1:]:
+            if line.strip():
+                pairing = PairingResult(**json.loads(line))
+                finished[pairing.players] = pairing
+        return finished
+
+    def _play(
+        self,
+        pairs: list[tuple[str, str]],
+        round: int,
+        finished: dict[tuple[str, str], PairingResult],
+        progress: Callable[[PairingResult], None] | None,
+    ) -> None:
+        jobs = [
+            (pair, self.seed_of(pair))
+            for pair in pairs
+            if pair not in finished
+        ]
+        for pairing in self._results(jobs, round):
+            finished[pairing.players] = pairing
+            self._save(pairing)
+            if progress:
+                progress(pairing)
+
+    def _results(
+        self, jobs: list[tuple[tuple[str, str], int | None]], round: int
+    ) -> Iterator[PairingResult]:
+        arguments = [
+            (a, self.players[a], b, self.players[b], self.games, seed, self.geometry)
+            for (a, b), seed in jobs
+        ]
+        if self.workers == 1 or len(jobs) < 2:
+            for args in arguments:
+                yield play_pairing(*args, round)
+            return
+        # the pairings are saved as they finish, so an interruption loses
+        # only the ones still in progress
+        with ProcessPoolExecutor(min(self.workers, len(jobs))) as executor:
+            pending: set[Future] = {
+                executor.submit(play_pairing, *args, round) for args in arguments
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _save(self, pairing: PairingResult) -> None:
+        if self.checkpoint is None:
+            return
+        new_file = not self.checkpoint.exists() or not self.checkpoint.stat().st_size
+        with open(self.checkpoint, "a", encoding="utf-8") as file:
+            if new_file:
+                file.write(json.dumps({"tournament": self.settings}) + "\n")
+            file.write(json.dumps(asdict(pairing)) + "\n")
+
+    # every pairing gets its own seed, which doesn't depend on the schedule
+    def seed_of(self, pair: tuple[str, str]) -> int | None:
+        if self.seed is None:
+            return None
+        names = list(self.players)
+        a, b = (names.index(name) for name in pair)
+        return self.seed + 4 * (a * len(names) + b)
+
+"""
+Play one pairing, split into four chunks of games, so that each player
+takes crosses in half of them, and each mark starts in half of them.
+Reseeding each chunk keeps the results reproducible with a given seed.
+"""
+def play_pairing(
+    name_a: str,
+    player_a: PlayerFactory,
+    name_b: str,
+    player_b: PlayerFactory,
+    games: int,
+    seed: int | None = None,
+    geometry: Geometry = CLASSIC,
+    round: int = 1,
+) -> PairingResult:
+    a_wins = b_wins = ties = 0
+    elapsed = 0.0
+    variants = [
+        (a_plays_x, starting_mark)
+        for a_plays_x in (True, False)
+        for starting_mark in (Mark.CROSS, Mark.NAUGHT)
+    ]
+    for index, ((a_plays_x, starting_mark), chunk) in enumerate(
+        zip(variants, split(games, len(variants)))
+    ):
+        players = (player_a, player_b) if a_plays_x else (player_b, player_a)
+        chunk_seed = None if seed is None else seed + index
+        result = play_chunk(*players, chunk, starting_mark, chunk_seed, geometry)
+        if a_plays_x:
+            a_wins, b_wins = a_wins + result.x_wins, b_wins + result.o_wins
+        else:
+            a_wins, b_wins = a_wins + result.o_wins, b_wins + result.x_wins
+        ties += result.ties
+        elapsed += result.elapsed
+    return PairingResult(name_a, name_b, a_wins, b_wins, ties, elapsed, round)
+
+def round_robin(players: list[str]) -> list[tuple[str, str]]:
+    return list(combinations(players, 2))
+
+"""
+the players sorted by the points that they've scored so far, with ties
+broken by the order in which they entered the tournament
+"""
+def rank(players: Iterable[str], pairings: Iterable[PairingResult]) -> list[str]:
+    points = dict.fromkeys(players, 0.0)
+    for pairing in pairings:
+        points[pairing.player_a] += pairing.a_wins + pairing.ties / 2
+        points[pairing.player_b] += pairing.b_wins + pairing.ties / 2
+    order = list(players)
+    return sorted(order, key=lambda player: (-points[player], order.index(player)))
+
+"""
+Pair each player, from the top of the standings down, with the highest
+ranked player whom they haven't met yet. The pairings are deterministic,
+so a resumed tournament schedules the same rounds as the original one.
+"""
+def swiss_pairings(
+    standings: list[str], played: Iterable[tuple[str, str]]
+) -> list[tuple[str, str]]:
+    met = {frozenset(pair) for pair in played}
+    unpaired = list(standings)
+    pairs = []
+    while len(unpaired) > 1:
+        player = unpaired.pop(0)
+        for opponent in unpaired:
+            if frozenset((player, opponent)) not in met:
+                unpaired.remove(opponent)
+                pairs.append((player, opponent))
+                break
+    return pairs
+
+"""
+Fit the Bradley-Terry model, which underlies the Elo ratings, to all the
+games by maximum likelihood, counting a tie as half a win for each side.
+Every pairing also gets one virtual tie, which keeps the rating of a
+player who never loses, or never wins, from running off to infinity.
+
+The confidence intervals come from the curvature of the likelihood at
+its maximum, which approximates the standard error of each rating.
+"""
+def fit_ratings(
+    pairings: Iterable[PairingResult],
+    iterations: int = 1000,
+    tolerance: float = 1e-9,
+) -> list[Rating]:
+    pairings = list(pairings)
+    players = list(dict.fromkeys(name for p in pairings for name in p.players))
+    points = dict.fromkeys(players, 0.0)
+    games: dict[str, int] = dict.fromkeys(players, 0)
+    counts: dict[tuple[str, str], float] = {}
+    wins = dict.fromkeys(players, 0.0)
+    for pairing in pairings:
+        a, b = pairing.players
+        points[a] += pairing.a_wins + pairing.ties / 2
+        points[b] += pairing.b_wins + pairing.ties / 2
+        games[a] += pairing.games
+        games[b] += pairing.games
+        wins[a] += pairing.a_wins + (pairing.ties + 1) / 2
+        wins[b] += pairing.b_wins + (pairing.ties + 1) / 2
+        for pair in ((a, b), (b, a)):
+            counts[pair] = counts.get(pair, 0.0) + pairing.games + 1
+    strength = dict.fromkeys(players, 1.0)
+    for _ in range(iterations):
+        updated = {
+            player: wins[player] / sum(
+                count / (strength[player] + strength[opponent])
+                for (first, opponent), count in counts.items()
+                if first == player
+            )
+            for player in players
+        }
+        # keep the geometric mean at one, which centers the ratings on ELO_MEAN
+        mean = math.exp(sum(map(math.log, updated.values())) / len(players))
+        updated = {player: value / mean for player, value in updated.items()}
+        change = max(abs(updated[p] - strength[p]) for p in players)
+        strength = updated
+        if change < tolerance:
+            break
+    ratings = []
+    for player in players:
+        information = sum(
+            count * strength[player] * strength[opponent]
+            / (strength[player] + strength[opponent]) ** 2
+            for (first, opponent), count in counts.items()
+            if first == player
+        )
+        elo = ELO_MEAN + ELO_SCALE * math.log(strength[player])
+        margin = Z_95 * ELO_SCALE / math.sqrt(information)
+        ratings.append(
+            Rating(
+                player, elo, elo - margin, elo + margin, games[player], points[player]
+            )
+        )
+    return sorted(ratings, key=lambda rating: -rating.elo)
@@ -0,0 +1,9 @@
+"""
+The analysis API is re-exported here for convenience, but imported only
+on first use, so that importing the models doesn't load the search.
+"""
+def __getattr__(name: str):
+    if name in ("analyze", "MoveAnalysis"):
+        from tic_tac_toe.logic import analysis
+        return getattr(analysis, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
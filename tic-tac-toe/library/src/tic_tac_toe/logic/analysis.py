@@ -0,0 +1,136 @@
+"""
+Score every possible move of a position in one search, telling not only
+whether the move wins, ties, or loses, but also how many moves it takes
+to get there with best play from both sides, and what those moves are.
+
+Each position gets a single value, seen from the player to move, which
+folds the outcome and the distance to it into one integer. A position
+won in d moves is worth (SCALE - d), a position lost in d moves is worth
+-(SCALE - d), and a tie is worth zero. SCALE is one more than the number
+of cells, which bounds the length of a game, so a faster win always beats a slower one, and a slower
+loss always beats a faster one, so the plain negamax recursion already
+prefers the shortest way to win and the longest way to lose.
+
+Unlike the scores in minimax.transposition_table, these values don't
+depend on the maximizing player, so all the moves of one position, and
+of all the following positions, share the same cached entries.
+"""
+
+import time
+from dataclasses import dataclass
+
+from tic_tac_toe.logic.minimax import SearchStats, order_moves
+from tic_tac_toe.logic.models import GameState, Move
+from tic_tac_toe.logic.transposition import TranspositionTable, canonical_cells
+
+# values of the positions searched so far, keyed by their symmetry class
+position_values = TranspositionTable()
+
+"""
+The outcome of one move for the player who makes it: 1 for a win, 0 for
+a tie, and -1 for a loss. The depth is the number of moves until the end
+of the game, counting this one, and the principal variation lists the
+cells of those moves, in the order in which they're played.
+"""
+@dataclass(frozen=True)
+class MoveAnalysis:
+    move: Move
+    score: int
+    depth: int
+    principal_variation: tuple[int, ...]
+
+"""
+analyze every possible move of the given game state, in the order of
+.possible_moves, which you can rank from best to worst with preference()
+"""
+def analyze(
+    game_state: GameState, stats: SearchStats | None = None
+) -> list[MoveAnalysis]:
+    start = time.perf_counter()
+    try:
+        return [analyze_move(move, stats) for move in game_state.possible_moves]
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - start
+
+def analyze_move(move: Move, stats: SearchStats | None = None) -> MoveAnalysis:
+    value = -step(negamax(move.after_state, stats))
+    scale = move.before_state.grid.geometry.size + 1
+    return MoveAnalysis(
+        move=move,
+        score=(value > 0) - (value < 0),
+        depth=scale - abs(value) if value else move.before_state.grid.empty_count,
+        principal_variation=(move.cell_index, *principal_variation(move.after_state)),
+    )
+
+"""
+the sort key that puts the fastest win first and the fastest loss last
+"""
+def preference(analysis: MoveAnalysis) -> tuple[int, int]:
+    return analysis.score, -analysis.score * analysis.depth
+
+"""
+Prefers the fastest win, and the slowest loss, among the moves that
+find_best_move() considers equally good. Ties keep the move order of
+the alpha-beta search, so the player favors the center and the corners.
+"""
+def find_fastest_move(
+    game_state: GameState, stats: SearchStats | None = None
+) -> Move | None:
+    start = time.perf_counter()
+    try:
+        return max(
+            order_moves(game_state.possible_moves),
+            key=lambda move: -step(negamax(move.after_state, stats)),
+            default=None,
+        )
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - start
+
+"""
+the value of a game state for the player to move, following the scale
+described at the top of this module
+"""
+def negamax(game_state: GameState, stats: SearchStats | None = None) -> int:
+    geometry = game_state.grid.geometry
+    key = (
+        canonical_cells(game_state.grid.cells, geometry.rows, geometry.columns),
+        geometry,
+        game_state.current_mark,
+    )
+    value = position_values.get(key)
+    if value is None:
+        if stats is not None:
+            stats.nodes += 1
+        if game_state.winner is not None:
+            value = -(geometry.size + 1)  # the opponent has just won
+        elif game_state.tie:
+            value = 0
+        else:
+            value = max(
+                -step(negamax(move.after_state, stats))
+                for move in game_state.possible_moves
+            )
+            game_state.release_moves()
+        position_values.put(key, value)
+    return value
+
+"""
+the best line of play from the given game state until the end of the
+game, which only follows the values already in the table
+"""
+def principal_variation(game_state: GameState) -> tuple[int, ...]:
+    cells = []
+    while not game_state.game_over:
+        value = negamax(game_state)
+        for move in game_state.possible_moves:
+            if -step(negamax(move.after_state)) == value:
+                break
+        cells.append(move.cell_index)
+        game_state = move.after_state
+    return tuple(cells)
+
+# move a value one ply further away from the end of the game
+def step(value: int) -> int:
+    return value - (value > 0) + (value < 0)
@@ -6,4 +6,10 @@ class InvalidMove(Exception):
     """Raised when the move is invalid."""
 
 class UnknownGameScore(Exception):
-    """Raised when the games score is unknown."""
\ No newline at end of file
+    """Raised when the games score is unknown."""
+
+class EngineError(Exception):
+    """Raised when an external engine fails to answer a request."""
+
+class EngineTimeout(EngineError, TimeoutError):
+    """Raised when an external engine doesn't answer in time."""
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Heuristic evaluators estimate how good an unfinished game is for the
+given player when the search can't afford to look all the way to the
+end. They must return a value strictly between -1 and 1, so that a
+proven win or loss, scored by GameState.evaluate_score(), always
+outweighs a mere guess.
+"""
+
+from typing import Callable, TypeAlias
+
+from tic_tac_toe.logic.models import GameState, Mark
+
+Evaluator: TypeAlias = Callable[[GameState, Mark], float]
+
+def zero(game_state: GameState, mark: Mark) -> float:
+    return 0.0
+
+"""
+Count the lines that are still open for each player, which means that
+the opponent hasn't marked any of their cells yet. Lines with more of
+the player's marks weigh exponentially more, because they're closer to
+completion. The balance between both players is then squashed into the
+open interval (-1, 1).
+"""
+def open_lines(game_state: GameState, mark: Mark) -> float:
+    bitboard = game_state.grid.bitboard
+    if mark is Mark.CROSS:
+        mine, theirs = bitboard.crosses, bitboard.naughts
+    else:
+        mine, theirs = bitboard.naughts, bitboard.crosses
+    my_score = their_score = 0
+    for mask in game_state.grid.geometry.winning_masks:
+        if not theirs & mask:
+            my_score += 1 << 2 * (mine & mask).bit_count()
+        if not mine & mask:
+            their_score += 1 << 2 * (theirs & mask).bit_count()
+    return (my_score - their_score) / (my_score + their_score + 1)
+
+"""
+Compare the number of empty cells, where each player could complete a
+line with their next mark. The threats come from the same analysis of
+the lines as the winner, so a position that was already checked for a
+winner costs next to nothing to evaluate.
+"""
+def threats(game_state: GameState, mark: Mark) -> float:
+    mine = {threat.cell_index for threat in game_state.threats if threat.mark is mark}
+    theirs = {threat.cell_index for threat in game_state.threats if threat.mark is not mark}
+    return (len(mine) - len(theirs)) / (len(mine) + len(theirs) + 1)
+
+EVALUATORS: dict[str, Evaluator] = {
+    "zero": zero,
+    "open_lines": open_lines,
+    "threats": threats,
+}
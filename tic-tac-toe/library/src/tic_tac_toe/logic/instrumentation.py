@@ -0,0 +1,274 @@
+"""
+Opt-in instrumentation of the hot paths, which shows where the time goes
+while playing. Once enabled, it records:
+
+    engine.move              seconds per move in TicTacToe.play()
+    <Player>.get_move        seconds per move of each player class
+    search.nodes/cutoffs     per search of the minimax computer player
+    GameState.__init__       number of validated game states created
+    GameState._trusted       number of game states created by moves
+    <Class>.<property>.hit   cached property served from the cache
+    <Class>.<property>.miss  cached property computed from scratch
+
+The measurements go to one or more pluggable sinks, such as in-memory
+histograms or a JSON lines file, and the whole session can optionally be
+captured with cProfile. While disabled, the engine and the players only
+check whether .active is set, once per move. Counting the game states
+and cache hits patches the model classes for the duration of the session
+instead, so the search itself runs the original, uninstrumented code.
+"""
+
+import abc
+import math
+import sys
+import time
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TextIO
+
+from tic_tac_toe.logic.models import GameState, Grid, cached_slot
+
+# the engine imports this module, so the profilers load only when used
+if TYPE_CHECKING:
+    import cProfile
+
+INSTRUMENTED_CLASSES = (Grid, GameState)
+
+# below the exponent of the smallest positive float
+ZERO_BUCKET = -1075
+
+class Sink(metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    def record(self, name: str, value: float) -> None:
+        """Record a single measurement, such as the duration of a move."""
+
+    @abc.abstractmethod
+    def count(self, name: str, total: int) -> None:
+        """Record the final value of a counter at the end of a session."""
+
+    def close(self) -> None:
+        pass
+
+"""
+Groups the measurements into buckets, whose bounds grow by powers of
+two, so the memory usage doesn't depend on the number of measurements.
+The percentiles are therefore approximated by the upper bound of the
+bucket that they fall into. Zero, such as a search without cutoffs,
+gets a bucket of its own.
+"""
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.buckets[math.frexp(value)[1] if value > 0 else ZERO_BUCKET] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        rank = fraction * self.count
+        seen = 0
+        for exponent in sorted(self.buckets):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                if exponent == ZERO_BUCKET:
+                    return 0.0
+                return min(math.ldexp(1.0, exponent), self.max)
+        return self.max
+
+class HistogramSink(Sink):
+    def __init__(self) -> None:
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+
+    def record(self, name: str, value: float) -> None:
+        if (histogram := self.histograms.get(name)) is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(value)
+
+    def count(self, name: str, total: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + total
+
+"""
+appends one JSON document per measurement or counter to a file, which
+other tools can aggregate across many sessions
+"""
+class JsonLinesSink(Sink):
+    def __init__(self, path: Path | str) -> None:
+        self.file = open(path, "a", encoding="utf-8")
+
+    def record(self, name: str, value: float) -> None:
+        self._write({"event": name, "value": value, "time": time.time()})
+
+    def count(self, name: str, total: int) -> None:
+        self._write({"counter": name, "value": total, "time": time.time()})
+
+    def close(self) -> None:
+        self.file.close()
+
+    def _write(self, document: dict[str, Any]) -> None:
+        import json
+        self.file.write(json.dumps(document) + "\n")
+
+"""
+An instrumentation session, which collects the measurements between
+.enable() and .disable(), or within a with statement. Only one session
+can be active at a time.
+"""
+class Instrumentation:
+    def __init__(
+        self,
+        *sinks: Sink,
+        profile: bool = False,
+        count_states: bool = True,
+    ) -> None:
+        self.sinks = sinks or (HistogramSink(),)
+        self.profiler: "cProfile.Profile | None" = None
+        if profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.count_states = count_states
+        self.counters: Counter[str] = Counter()
+        self._patches: list[tuple[type, str, Any]] = []
+
+    def __enter__(self) -> "Instrumentation":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def enable(self) -> None:
+        global active
+        if active is not None:
+            raise RuntimeError("Another instrumentation session is active")
+        if self.count_states:
+            self._patch_models()
+        active = self
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def disable(self) -> None:
+        global active
+        if active is not self:
+            return
+        if self.profiler is not None:
+            self.profiler.disable()
+        active = None
+        self._unpatch_models()
+        for sink in self.sinks:
+            for name, total in sorted(self.counters.items()):
+                sink.count(name, total)
+            sink.close()
+        self.counters.clear()
+
+    def emit(self, name: str, value: float) -> None:
+        for sink in self.sinks:
+            sink.record(name, value)
+
+    def report(self, file: TextIO = sys.stderr) -> None:
+        for sink in self.sinks:
+            if isinstance(sink, HistogramSink):
+                print_histograms(sink, file)
+        if self.profiler is not None:
+            import io
+            import pstats
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(20)
+            print(stream.getvalue(), file=file)
+
+    def _patch_models(self) -> None:
+        counters = self.counters
+        self._patch(GameState, "__init__", _counting(GameState.__init__, counters))
+        trusted = GameState.__dict__["_trusted"].__func__
+        self._patch(GameState, "_trusted", classmethod(_counting(trusted, counters)))
+        for cls in INSTRUMENTED_CLASSES:
+            for name, attribute in list(vars(cls).items()):
+                if isinstance(attribute, cached_slot):
+                    self._patch(cls, name, CountingProperty(attribute, cls, counters))
+
+    def _patch(self, cls: type, name: str, replacement: Any) -> None:
+        self._patches.append((cls, name, cls.__dict__[name]))
+        setattr(cls, name, replacement)
+
+    def _unpatch_models(self) -> None:
+        while self._patches:
+            cls, name, original = self._patches.pop()
+            setattr(cls, name, original)
+
+"""
+Stands in for a cached property while counting the hits and misses,
+leaving the caching itself to the original descriptor.
+"""
+class CountingProperty:
+    def __init__(
+        self, original: cached_slot, owner: type, counters: Counter[str]
+    ) -> None:
+        self.original = original
+        self.hit = f"{owner.__name__}.{original.name}.hit"
+        self.miss = f"{owner.__name__}.{original.name}.miss"
+        self.counters = counters
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        if self.original.is_cached(instance):
+            self.counters[self.hit] += 1
+        else:
+            self.counters[self.miss] += 1
+        return self.original.__get__(instance, owner)
+
+    def forget(self, instance: Any) -> None:
+        self.original.forget(instance)
+
+def _counting(function: Callable, counters: Counter[str]) -> Callable:
+    name = function.__qualname__
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        counters[name] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+def print_histograms(sink: HistogramSink, file: TextIO = sys.stderr) -> None:
+    print(
+        f"{'measurement':<36}{'count':>8}{'mean':>12}{'p50':>12}"
+        f"{'p90':>12}{'p99':>12}{'max':>12}",
+        file=file,
+    )
+    for name, histogram in sorted(sink.histograms.items()):
+        print(
+            f"{name:<36}{histogram.count:>8}{histogram.mean:>12.6g}"
+            f"{histogram.percentile(0.5):>12.6g}{histogram.percentile(0.9):>12.6g}"
+            f"{histogram.percentile(0.99):>12.6g}{histogram.max:>12.6g}",
+            file=file,
+        )
+    if not sink.counters:
+        return
+    print(f"\n{'counter':<36}{'total':>12}{'hit rate':>12}", file=file)
+    names = {name.removesuffix(".hit").removesuffix(".miss") for name in sink.counters}
+    for name in sorted(names):
+        if name in sink.counters:
+            print(f"{name:<36}{sink.counters[name]:>12}", file=file)
+        else:
+            hits = sink.counters.get(f"{name}.hit", 0)
+            total = hits + sink.counters.get(f"{name}.miss", 0)
+            print(f"{name:<36}{total:>12}{hits / total:>12.1%}", file=file)
+
+# the session currently collecting measurements, if any
+active: Instrumentation | None = None
+
+def emit(name: str, value: float) -> None:
+    if active is not None:
+        active.emit(name, value)
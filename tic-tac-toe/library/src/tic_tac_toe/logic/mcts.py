@@ -0,0 +1,184 @@
+"""
+Monte Carlo Tree Search grows a partial game tree guided by the outcomes
+of random playouts instead of exhaustively scoring every position, which
+makes it usable on boards where minimax can't reach the end of the game.
+Each iteration selects a promising leaf with the UCT formula, expands it
+by one move, plays random games from there, and propagates the results
+back up to the root.
+
+The playouts of a leaf can be split across a pool of worker threads or
+processes, and the tree is kept between consecutive moves, so the next
+search starts from the statistics gathered for the opponent's reply.
+"""
+
+import math
+import os
+import random
+import time
+from typing import TYPE_CHECKING
+
+from tic_tac_toe.logic.models import GameState, Geometry, Grid, Mark, Move
+
+# the worker pools are imported only when the playouts are split up
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+class Node:
+    def __init__(self, game_state: GameState, parent: "Node | None" = None) -> None:
+        self.game_state = game_state
+        self.parent = parent
+        self.children: dict[int, Node] = {}
+        self.untried = list(game_state.possible_moves.cell_indices)
+        random.shuffle(self.untried)
+        self.visits = 0
+        self.score = 0.0  # from the perspective of the player who moved here
+
+    def uct_child(self, exploration: float) -> "Node":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.score / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+    def expand(self) -> "Node":
+        index = self.untried.pop()
+        child = Node(self.game_state.make_move_to(index).after_state, self)
+        self.children[index] = child
+        return child
+
+    def update(self, x_wins: int, o_wins: int, ties: int) -> None:
+        self.visits += x_wins + o_wins + ties
+        wins = x_wins if self.game_state.current_mark is Mark.NAUGHT else o_wins
+        self.score += wins + ties / 2
+
+"""
+play random games until the end and count their outcomes; the arguments
+are plain values, so they can be sent to another process cheaply
+"""
+def rollout(
+    cells: str, starting_mark: Mark, geometry: Geometry, count: int
+) -> tuple[int, int, int]:
+    x_wins = o_wins = ties = 0
+    start_state = GameState(Grid(cells, geometry), starting_mark)
+    for _ in range(count):
+        game_state = start_state
+        while move := game_state.make_random_move():
+            game_state = move.after_state
+        if game_state.winner is Mark.CROSS:
+            x_wins += 1
+        elif game_state.winner is Mark.NAUGHT:
+            o_wins += 1
+        else:
+            ties += 1
+    return x_wins, o_wins, ties
+
+# forked worker processes would otherwise share the parent's random state
+def _reseed() -> None:
+    random.seed()
+
+class MonteCarloTreeSearch:
+    def __init__(
+        self,
+        iterations: int | None = 1000,
+        time_budget: float | None = None,
+        exploration: float = math.sqrt(2),
+        rollouts_per_leaf: int = 1,
+        workers: int = 1,
+        use_processes: bool = True,
+    ) -> None:
+        if iterations is None and time_budget is None:
+            raise ValueError("Either iterations or time budget is required")
+        if iterations is not None and iterations <= 0:
+            raise ValueError("The number of iterations must be positive")
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.workers = workers or os.cpu_count() or 1
+        self.rollouts_per_leaf = max(rollouts_per_leaf, self.workers)
+        self.use_processes = use_processes
+        self.root: Node | None = None
+        self.last_iterations = 0
+        self._executor: "Executor | None" = None
+
+    def __enter__(self) -> "MonteCarloTreeSearch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def find_best_move(self, game_state: GameState) -> Move | None:
+        if game_state.game_over:
+            return None
+        self.root = self._reuse_tree(game_state) or Node(game_state)
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        self.last_iterations = 0
+        while self.iterations is None or self.last_iterations < self.iterations:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self._iterate(self.root)
+            self.last_iterations += 1
+        if not self.root.children:
+            return game_state.make_random_move()
+        index, _ = max(
+            self.root.children.items(), key=lambda item: item[1].visits
+        )
+        return game_state.make_move_to(index)
+
+    def _iterate(self, root: Node) -> None:
+        node = root
+        while not node.untried and node.children:
+            node = node.uct_child(self.exploration)
+        if node.untried:
+            node = node.expand()
+        x_wins, o_wins, ties = self._simulate(node.game_state)
+        while node is not None:
+            node.update(x_wins, o_wins, ties)
+            node = node.parent
+
+    def _simulate(self, game_state: GameState) -> tuple[int, int, int]:
+        args = (game_state.grid.cells, game_state.starting_mark, game_state.grid.geometry)
+        if game_state.game_over or self.workers == 1:
+            return rollout(*args, self.rollouts_per_leaf)
+        quotient, remainder = divmod(self.rollouts_per_leaf, self.workers)
+        futures = [
+            self._get_executor().submit(rollout, *args, quotient + (i < remainder))
+            for i in range(self.workers)
+        ]
+        results = [future.result() for future in futures]
+        return tuple(sum(counts) for counts in zip(*results))  # type: ignore
+
+    def _get_executor(self) -> "Executor":
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=_reseed)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers)
+        return self._executor
+
+    """
+    look for the current position among the children and grandchildren
+    of the previous root, which covers our own move and the opponent's
+    reply, and keep the statistics of that subtree
+    """
+    def _reuse_tree(self, game_state: GameState) -> Node | None:
+        if self.root is None:
+            return None
+        candidates = [self.root]
+        for _ in range(3):
+            for node in candidates:
+                if node.game_state == game_state:
+                    node.parent = None
+                    return node
+            candidates = [
+                child for node in candidates for child in node.children.values()
+            ]
+        return None
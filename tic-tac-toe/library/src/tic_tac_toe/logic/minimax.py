@@ -1,31 +1,370 @@
-from tic_tac_toe.logic.models import Mark, Move, GameState
-from functools import partial
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
 
+from tic_tac_toe.logic.heuristics import Evaluator, open_lines
+from tic_tac_toe.logic.models import Geometry, Grid, Mark, Move, GameState
+from tic_tac_toe.logic.transposition import TranspositionTable, canonical_cells
+from functools import lru_cache, partial
+
+# the process pool is only needed, and imported, by a parallel search
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+"""
+scores of positions that have already been searched, shared by all
+minimax() calls in the current process. Symmetric boards map to the
+same entry, so the whole game tree collapses to a few thousand keys.
+"""
+transposition_table = TranspositionTable()
+
+"""
+static move ordering for alpha-beta pruning, which sorts the cells by
+the number of winning lines passing through them, since those tend to
+produce cutoffs sooner. On the classic board, that puts the center
+first, then the corners, and finally the edges.
+"""
+@lru_cache(maxsize=None)
+def move_order(geometry: Geometry) -> tuple[int, ...]:
+    return tuple(
+        sorted(
+            range(geometry.size),
+            key=lambda index: -len(geometry.masks_through[index]),
+        )
+    )
+
+@lru_cache(maxsize=None)
+def move_ranks(geometry: Geometry) -> dict[int, int]:
+    return {index: rank for rank, index in enumerate(move_order(geometry))}
+
+"""
+counters collected during a single search, which let you compare the
+number of visited nodes and the wall-clock time of different algorithms
 """
-find the best move in a given game state, you can sort all 
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    cutoffs: int = 0
+    elapsed: float = 0.0
+    depth: int = 0
+
+"""
+find the best move in a given game state, you can sort all
 possible moves by score and take the one with the highest value.
 
-takes some game state and returns either the best move for the 
-current player or None to indicate that no more moves are possible. 
+takes some game state and returns either the best move for the
+current player or None to indicate that no more moves are possible.
 """
-def find_best_move(game_state: GameState) -> Move | None:
+def find_best_move(
+    game_state: GameState, stats: SearchStats | None = None
+) -> Move | None:
     maximizer: Mark = game_state.current_mark
     """
-    use of a partial function to freeze the value of the maximizer 
+    use of a partial function to freeze the value of the maximizer
     argument, which doesn’t change across minimax() invocations.
     """
-    bound_minimax = partial(minimax, maximizer=maximizer)
-    return max(game_state.possible_moves, key=bound_minimax)
+    bound_minimax = partial(minimax, maximizer=maximizer, stats=stats)
+    start = time.perf_counter()
+    try:
+        return max(game_state.possible_moves, key=bound_minimax)
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - start
 
 """
-returns the score associated with the move passed as an argument for 
+returns the score associated with the move passed as an argument for
 the indicated maximizing player.
 """
-def minimax(move: Move, maximizer: Mark, choose_highest_score: bool = False) -> int:
-    if move.after_state.game_over:
-        return move.after_state.evaluate_score(maximizer)
-    return (max if choose_highest_score else min)(
-        minimax(next_move, maximizer, not choose_highest_score)
-        for next_move in move.after_state.possible_moves
+def minimax(
+    move: Move,
+    maximizer: Mark,
+    choose_highest_score: bool = False,
+    stats: SearchStats | None = None,
+) -> int:
+    after_state = move.after_state
+    geometry = after_state.grid.geometry
+    key = (
+        canonical_cells(after_state.grid.cells, geometry.rows, geometry.columns),
+        geometry,
+        after_state.current_mark,
+        maximizer,
+        choose_highest_score,
     )
+    score = transposition_table.get(key)
+    if score is None:
+        if stats is not None:
+            stats.nodes += 1
+        if after_state.game_over:
+            score = after_state.evaluate_score(maximizer)
+        else:
+            score = (max if choose_highest_score else min)(
+                minimax(next_move, maximizer, not choose_highest_score, stats)
+                for next_move in after_state.possible_moves
+            )
+            # the score is in the table now, so the moves won't be needed again
+            after_state.release_moves()
+        transposition_table.put(key, score)
+    return score
+
+"""
+Splits the root of find_best_move() across a pool of worker processes,
+one subtree per possible move, and merges the scores in the original
+order of the moves, so the result is the same as the sequential search,
+ties included. The pool outlives a single search, which lets each worker
+keep its own transposition table warm between the turns of a game.
+
+Positions with fewer than .min_empty_cells empty cells are searched
+sequentially, because their subtrees are too small to make up for the
+cost of sending the work to another process.
+"""
+class ParallelSearch:
+    def __init__(self, workers: int | None = None, min_empty_cells: int = 8) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.min_empty_cells = min_empty_cells
+        self._executor: "Executor | None" = None
+
+    def __enter__(self) -> "ParallelSearch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def find_best_move(
+        self, game_state: GameState, stats: SearchStats | None = None
+    ) -> Move | None:
+        moves = list(game_state.possible_moves)
+        if (
+            self.workers == 1
+            or len(moves) < 2
+            or game_state.grid.empty_count < self.min_empty_cells
+        ):
+            return find_best_move(game_state, stats)
+        start = time.perf_counter()
+        results = list(
+            self._get_executor().map(
+                score_subtree,
+                [game_state.grid.cells] * len(moves),
+                [game_state.starting_mark] * len(moves),
+                [game_state.grid.geometry] * len(moves),
+                [move.cell_index for move in moves],
+            )
+        )
+        if stats is not None:
+            stats.nodes += sum(nodes for _, nodes in results)
+            stats.elapsed += time.perf_counter() - start
+        scores = [score for score, _ in results]
+        return moves[scores.index(max(scores))]
+
+    def _get_executor(self) -> "Executor":
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+"""
+the score of one root move along with the number of nodes visited, which
+runs in a worker process, so it takes plain values that pickle cheaply
+"""
+def score_subtree(
+    cells: str, starting_mark: Mark, geometry: Geometry, index: int
+) -> tuple[int, int]:
+    game_state = GameState(Grid(cells, geometry), starting_mark)
+    stats = SearchStats()
+    score = minimax(game_state.make_move_to(index), game_state.current_mark, stats=stats)
+    return score, stats.nodes
+
+"""
+the same search as find_best_move(), but it skips the subtrees that
+can't affect the result. The moves are tried in the move_order(), except
+for killer moves, which caused a cutoff at the same depth before and
+are likely to cause one again, so they go first.
+"""
+def find_best_move_alphabeta(
+    game_state: GameState, stats: SearchStats | None = None
+) -> Move | None:
+    maximizer: Mark = game_state.current_mark
+    killers: dict[int, int] = {}
+    best_move, best_score, alpha = None, -math.inf, -math.inf
+    start = time.perf_counter()
+    for move in order_moves(game_state.possible_moves):
+        score = alphabeta(move, maximizer, alpha, math.inf, False, stats, killers)
+        if score > best_score:
+            best_move, best_score = move, score
+            alpha = max(alpha, score)
+    if stats is not None:
+        stats.elapsed += time.perf_counter() - start
+    return best_move
+
+def alphabeta(
+    move: Move,
+    maximizer: Mark,
+    alpha: float = -math.inf,
+    beta: float = math.inf,
+    choose_highest_score: bool = False,
+    stats: SearchStats | None = None,
+    killers: dict[int, int] | None = None,
+    depth: int = 1,
+) -> int:
+    after_state = move.after_state
+    if stats is not None:
+        stats.nodes += 1
+    if after_state.game_over:
+        return after_state.evaluate_score(maximizer)
+    if killers is None:
+        killers = {}
+    best_score = -math.inf if choose_highest_score else math.inf
+    for next_move in order_moves(after_state.possible_moves, killers.get(depth)):
+        score = alphabeta(
+            next_move,
+            maximizer,
+            alpha,
+            beta,
+            not choose_highest_score,
+            stats,
+            killers,
+            depth + 1,
+        )
+        if choose_highest_score:
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+        else:
+            best_score = min(best_score, score)
+            beta = min(beta, score)
+        if alpha >= beta:
+            if stats is not None:
+                stats.cutoffs += 1
+            killers[depth] = next_move.cell_index
+            break
+    return best_score
+
+def order_moves(moves: Sequence[Move], killer: int | None = None) -> list[Move]:
+    if not moves:
+        return []
+    ranks = move_ranks(moves[0].before_state.grid.geometry)
+    return sorted(
+        moves,
+        key=lambda move: (move.cell_index != killer, ranks[move.cell_index]),
+    )
+
+class BudgetExhausted(Exception):
+    """Raised internally when a search runs out of time or nodes."""
+
+"""
+limits on the wall-clock time and the number of nodes for one search
+"""
+class SearchBudget:
+    def __init__(
+        self,
+        time_budget: float | None = None,
+        node_budget: int | None = None,
+        stats: SearchStats | None = None,
+    ) -> None:
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.node_budget = node_budget
+        self.stats = stats
+        self.nodes = 0
+
+    def visit(self) -> None:
+        self.nodes += 1
+        if self.stats is not None:
+            self.stats.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise BudgetExhausted
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExhausted
+
+"""
+Search one ply deeper on every iteration, scoring unfinished games at
+the horizon with a heuristic evaluator, and stop as soon as the budget
+runs out. The result of the last completed iteration is always at hand,
+so the time it takes to move is bounded by the budget rather than by
+the size of the game tree. The best move of the previous iteration is
+searched first, which makes the following iteration prune more.
+"""
+def find_best_move_iterative(
+    game_state: GameState,
+    stats: SearchStats | None = None,
+    time_budget: float | None = None,
+    node_budget: int | None = None,
+    evaluator: Evaluator = open_lines,
+    max_depth: int | None = None,
+) -> Move | None:
+    moves = order_moves(game_state.possible_moves)
+    if not moves:
+        return None
+    maximizer: Mark = game_state.current_mark
+    budget = SearchBudget(time_budget, node_budget, stats)
+    killers: dict[int, int] = {}
+    best_move = moves[0]
+    max_depth = min(max_depth or game_state.grid.empty_count, game_state.grid.empty_count)
+    start = time.perf_counter()
+    try:
+        for depth in range(1, max_depth + 1):
+            moves.sort(key=lambda move: move is not best_move)
+            iteration_move, best_score, alpha = None, -math.inf, -math.inf
+            for move in moves:
+                score = depth_limited(
+                    move, maximizer, depth - 1, evaluator, budget,
+                    alpha, math.inf, False, stats, killers,
+                )
+                if score > best_score:
+                    iteration_move, best_score = move, score
+                    alpha = max(alpha, score)
+            best_move = iteration_move
+            if stats is not None:
+                stats.depth = depth
+            if abs(best_score) >= 1:
+                break  # the outcome is already decided
+    except BudgetExhausted:
+        pass
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - start
+    return best_move
 
+def depth_limited(
+    move: Move,
+    maximizer: Mark,
+    depth: int,
+    evaluator: Evaluator,
+    budget: SearchBudget,
+    alpha: float = -math.inf,
+    beta: float = math.inf,
+    choose_highest_score: bool = False,
+    stats: SearchStats | None = None,
+    killers: dict[int, int] | None = None,
+    ply: int = 1,
+) -> float:
+    budget.visit()
+    after_state = move.after_state
+    if after_state.game_over:
+        return after_state.evaluate_score(maximizer)
+    if depth == 0:
+        return evaluator(after_state, maximizer)
+    if killers is None:
+        killers = {}
+    best_score = -math.inf if choose_highest_score else math.inf
+    for next_move in order_moves(after_state.possible_moves, killers.get(ply)):
+        score = depth_limited(
+            next_move, maximizer, depth - 1, evaluator, budget,
+            alpha, beta, not choose_highest_score, stats, killers, ply + 1,
+        )
+        if choose_highest_score:
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+        else:
+            best_score = min(best_score, score)
+            beta = min(beta, score)
+        if alpha >= beta:
+            if stats is not None:
+                stats.cutoffs += 1
+            killers[ply] = next_move.cell_index
+            break
+    return best_score
@@ -6,25 +6,127 @@ the domain that incorporates both behavior and data.
 """
 
 import enum
-import re
 import random
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from functools import cached_property
+from operator import attrgetter
+from typing import Any, Callable, NamedTuple, overload
 
-from tic_tac_toe.logic.validators import validate_grid, validate_game_state
+from tic_tac_toe.logic.validators import (
+    validate_game_state,
+    validate_geometry,
+    validate_grid,
+)
 from tic_tac_toe.logic.exceptions import InvalidMove, UnknownGameScore
+from tic_tac_toe.logic.transposition import LRUCache
 
-# eight winning patterns for each of the two players
-WINNING_PATTERNS = (
-    "???......",
-    "...???...",
-    "......???",
-    "?..?..?..",
-    ".?..?..?.",
-    "..?..?..?",
-    "?...?...?",
-    "..?.?.?..",
-)
+"""
+A counterpart of @cached_property for classes with __slots__, which have
+no instance dictionary to keep the computed value in. The value goes to
+a slot named after the property with a leading underscore instead, for
+example, ._winner for .winner, which the class must declare as a field
+that's excluded from __init__(), repr(), and comparisons. Reading the
+slot through a C-level attrgetter keeps the cache hits cheap.
+"""
+class cached_slot(property):
+    def __init__(self, function: Callable[[Any], Any]) -> None:
+        slot = f"_{function.__name__}"
+        read = attrgetter(slot)
+
+        def getter(instance: Any) -> Any:
+            try:
+                return read(instance)
+            except AttributeError:
+                value = function(instance)
+                object.__setattr__(instance, slot, value)
+                return value
+
+        super().__init__(getter, doc=function.__doc__)
+        self.name = function.__name__
+        self.slot = slot
+
+    def is_cached(self, instance: Any) -> bool:
+        return hasattr(instance, self.slot)
+
+    def forget(self, instance: Any) -> None:
+        try:
+            object.__delattr__(instance, self.slot)
+        except AttributeError:
+            pass  # never computed, or forgotten by another thread
+
+def _cache() -> Any:
+    return field(init=False, repr=False, compare=False)
+
+"""
+The shape of the board and the number of marks in a row needed to win,
+also known as the m,n,k-game. The classic tic-tac-toe is a 3,3,3-game,
+while gomoku is played on a 15x15 board with five in a row. Winning
+lines are precomputed once per geometry as bitmasks, along with the
+lines passing through each cell, which lets you check for a winner
+by looking only at the lines through the most recently placed mark.
+"""
+@dataclass(frozen=True)
+class Geometry:
+    rows: int = 3
+    columns: int = 3
+    win_length: int = 3
+
+    def __post_init__(self) -> None:
+        validate_geometry(self)
+
+    @cached_property
+    def size(self) -> int:
+        return self.rows * self.columns
+
+    @cached_property
+    def full_mask(self) -> int:
+        return (1 << self.size) - 1
+
+    """
+    The win-line index, which lists the cells of every line of
+    .win_length cells, rows first, then columns, diagonals, and
+    anti-diagonals. On the classic board, that makes three rows, three
+    columns and the two diagonals.
+    """
+    @cached_property
+    def lines(self) -> tuple[tuple[int, ...], ...]:
+        lines = []
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for row in range(self.rows):
+                for column in range(self.columns):
+                    cells = [
+                        (row + row_step * i, column + column_step * i)
+                        for i in range(self.win_length)
+                    ]
+                    if all(
+                        0 <= r < self.rows and 0 <= c < self.columns
+                        for r, c in cells
+                    ):
+                        lines.append(tuple(r * self.columns + c for r, c in cells))
+        # a single cell is a line in every direction when one mark wins
+        return tuple(dict.fromkeys(lines))
+
+    # indices of the lines passing through each cell
+    @cached_property
+    def lines_through(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(
+            tuple(i for i, line in enumerate(self.lines) if index in line)
+            for index in range(self.size)
+        )
+
+    @cached_property
+    def winning_masks(self) -> tuple[int, ...]:
+        return tuple(sum(1 << index for index in line) for line in self.lines)
+
+    @cached_property
+    def masks_through(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(
+            tuple(self.winning_masks[i] for i in lines)
+            for lines in self.lines_through
+        )
+
+CLASSIC = Geometry()
 
 # define Mark as a mixin class of the str and enum.Enum types
 # so, we inherit str and enum.Enum
@@ -36,45 +138,203 @@ class Mark(str,enum.Enum):
     def other(self) -> "Mark":
         return Mark.CROSS if self is Mark.NAUGHT else Mark.NAUGHT
 
+"""
+a line that the given mark can complete by placing it on the empty cell
+"""
+class Threat(NamedTuple):
+    mark: Mark
+    line: int  # index into Geometry.lines
+    cell_index: int
+
+"""
+Everything that follows from the lines of one grid, collected in a single
+pass over the win-line index, so the winner, the winning cells, and the
+threats of both players never scan the grid more than once.
+"""
+class LineAnalysis(NamedTuple):
+    winner: Mark | None
+    winning_cells: list[int]
+    threats: tuple[Threat, ...]
+
+"""
+An alternative representation of the grid, which stores each player's
+marks as an integer with one bit per cell. Detecting a winner or listing
+the empty cells boils down to integer arithmetic instead of regular
+expressions and string slicing, which matters in the innermost loop of
+a game tree search.
+"""
+@dataclass(frozen=True, slots=True)
+class Bitboard:
+    crosses: int = 0
+    naughts: int = 0
+    geometry: Geometry = CLASSIC
+
+    @classmethod
+    def from_cells(cls, cells: str, geometry: Geometry = CLASSIC) -> "Bitboard":
+        return cls(
+            int(cells.translate(_CROSS_BITS)[::-1], 2),
+            int(cells.translate(_NAUGHT_BITS)[::-1], 2),
+            geometry,
+        )
+
+    @property
+    def cells(self) -> str:
+        return "".join(
+            "X" if self.crosses >> i & 1 else "O" if self.naughts >> i & 1 else " "
+            for i in range(self.geometry.size)
+        )
+
+    @property
+    def empty(self) -> int:
+        return self.geometry.full_mask & ~(self.crosses | self.naughts)
+
+    @property
+    def empty_indices(self) -> list[int]:
+        return _bit_indices(self.empty)
+
+    @property
+    def winning_mask(self) -> int:
+        for mask in self.geometry.winning_masks:
+            if self.crosses & mask == mask or self.naughts & mask == mask:
+                return mask
+        return 0
+
+    @property
+    def winner(self) -> Mark | None:
+        for mask in self.geometry.winning_masks:
+            if self.crosses & mask == mask:
+                return Mark.CROSS
+            if self.naughts & mask == mask:
+                return Mark.NAUGHT
+        return None
+
+    @property
+    def winning_cells(self) -> list[int]:
+        return _bit_indices(self.winning_mask)
+
+    """
+    The first complete line, in the order of the win-line index, decides
+    the winner like in .winner, while the scan goes on to collect the
+    lines that are one mark short of completion with the rest empty.
+    """
+    def analyze(self) -> LineAnalysis:
+        crosses, naughts = self.crosses, self.naughts
+        winner, winning_mask, threats = None, 0, []
+        for line, mask in enumerate(self.geometry.winning_masks):
+            if naughts & mask:
+                if crosses & mask:
+                    continue
+                mark, rest = Mark.NAUGHT, mask ^ naughts & mask
+            else:
+                mark, rest = Mark.CROSS, mask ^ crosses & mask
+            if not rest:
+                if winner is None:
+                    winner, winning_mask = mark, mask
+            elif not rest & (rest - 1):  # a single empty cell left
+                threats.append(Threat(mark, line, rest.bit_length() - 1))
+                if rest == mask:  # an empty line when one mark in a row wins
+                    threats.append(Threat(Mark.NAUGHT, line, rest.bit_length() - 1))
+        return LineAnalysis(winner, _bit_indices(winning_mask), tuple(threats))
+
+    """
+    only the lines through the given cell can be completed by a mark
+    placed there, so there's no need to scan the whole board
+    """
+    def winner_through(self, index: int) -> Mark | None:
+        for mask in self.geometry.masks_through[index]:
+            if self.crosses & mask == mask:
+                return Mark.CROSS
+            if self.naughts & mask == mask:
+                return Mark.NAUGHT
+        return None
+
+    def place(self, index: int, mark: Mark) -> "Bitboard":
+        bit = 1 << index
+        if (self.crosses | self.naughts) & bit:
+            raise InvalidMove("Cell is not empty")
+        if mark is Mark.CROSS:
+            return Bitboard(self.crosses | bit, self.naughts, self.geometry)
+        return Bitboard(self.crosses, self.naughts | bit, self.geometry)
+
+def _bit_indices(mask: int) -> list[int]:
+    indices = []
+    while mask:
+        lowest = mask & -mask
+        indices.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return indices
+
+_CROSS_BITS = str.maketrans("XO ", "100")
+_NAUGHT_BITS = str.maketrans("XO ", "010")
+
 """
 define Grid as a frozen data class to make its instances immutable so 
 that once you create a grid object, you won’t be able to alter its cells.
 """
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Grid:
     cells: str = " " * 9
+    geometry: Geometry = CLASSIC
+
+    _x_count: int = _cache()
+    _o_count: int = _cache()
+    _empty_count: int = _cache()
+    _bitboard: Bitboard = _cache()
 
     """
-    to check whether the given value of the .cells attribute is exactly 
-    nine characters long and contains only the expected characters—that 
-    is, "X", "O", or " ". 
+    to check whether the given value of the .cells attribute has exactly
+    one character per cell of the geometry, nine by default, and contains
+    only the expected characters—that is, "X", "O", or " ".
     """
     def __post_init__(self) -> None:
         # if not re.match(r"^[\sXO]{9}$", self.cells):
         #     raise ValueError("Must contain 9 cells of: X, O, or space")
         # Moved above two lines to a separate function in validators.py
         validate_grid(self)
+
+    """
+    build a grid without validating it, which is only safe for cells
+    derived from another valid grid inside the engine
+    """
+    @classmethod
+    def _trusted(cls, cells: str, geometry: Geometry = CLASSIC) -> "Grid":
+        grid = object.__new__(cls)
+        object.__setattr__(grid, "cells", cells)
+        object.__setattr__(grid, "geometry", geometry)
+        return grid
+
+    @classmethod
+    def blank(cls, geometry: Geometry = CLASSIC) -> "Grid":
+        return cls(" " * geometry.size, geometry)
+
+    # unset cache slots can't be pickled, so rebuild the grid from its cells
+    def __reduce__(self) -> tuple:
+        return Grid, (self.cells, self.geometry)
     
 
     """
     The three properties return the current number of crosses, naughts, 
     and empty cells, respectively. Because your data class is immutable, 
     its state will never change, so you can cache the computed property 
-    values with the help of the @cached_property decorator from the 
-    functools module.
+    values with the help of the @cached_slot decorator, which works like
+    @cached_property from the functools module.
     """ 
-    @cached_property
+    @cached_slot
     def x_count(self) -> int:
         return self.cells.count("X")
 
-    @cached_property
+    @cached_slot
     def o_count(self) -> int:
         return self.cells.count("O")
 
-    @cached_property
+    @cached_slot
     def empty_count(self) -> int:
         return self.cells.count(" ")
 
+    @cached_slot
+    def bitboard(self) -> Bitboard:
+        return Bitboard.from_cells(self.cells, self.geometry)
+
 """
 Data transfer Object (DTO) whose main purpose is to carry data, as it 
 doesn’t provide any behavior through methods or dynamically computed 
@@ -83,22 +343,114 @@ properties.
 Check whether a given move is valid, along with validating a specific 
 grid cell combination, in a class responsible for managing the game’s 
 state
+
+The resulting game state is only built when someone asks for it, and
+isn't kept by the move, because most moves considered by a player are
+never played. A move only points back to the state it's played from, so
+holding on to a game state doesn't keep the subtree below it alive.
 """
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Move:
     mark: Mark
     cell_index: int
     before_state: "GameState"
-    after_state: "GameState"
 
-@dataclass(frozen=True)
+    """
+    A legal move in a valid game state always leads to another valid game
+    state, so there's no need to validate it all over again. Positions
+    reached along different paths come from the shared game_state_pool,
+    which also returns the same state when you ask for it again.
+    """
+    @property
+    def after_state(self) -> "GameState":
+        grid = self.before_state.grid
+        return game_state_pool.get(
+            grid.cells[:self.cell_index] + self.mark + grid.cells[self.cell_index + 1:],
+            self.before_state.starting_mark,
+            grid.geometry,
+            self.cell_index,
+        )
+
+"""
+A read-only sequence of the moves available in a game state, which
+creates each Move object on first access. Callers that only need the
+cell indices, such as a random player picking one move, don't pay for
+the moves they never look at.
+"""
+class PossibleMoves(Sequence[Move]):
+    __slots__ = ("game_state", "cell_indices", "_moves")
+
+    def __init__(self, game_state: "GameState", cell_indices: list[int]) -> None:
+        self.game_state = game_state
+        self.cell_indices = cell_indices
+        self._moves: list[Move | None] = [None] * len(cell_indices)
+
+    def __len__(self) -> int:
+        return len(self.cell_indices)
+
+    @overload
+    def __getitem__(self, index: int) -> Move: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Move]: ...
+
+    def __getitem__(self, index: int | slice) -> Move | list[Move]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        move = self._moves[index]
+        if move is None:
+            move = self._moves[index] = Move(
+                self.game_state.current_mark,
+                self.cell_indices[index],
+                self.game_state,
+            )
+        return move
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+"""
+The optional .last_index is the cell of a mark that was placed last on
+some path leading to this position. For interned game states, it's the
+move that reached the position first. When it's known, the winner can
+only be on one of the lines through that cell, which is what makes win
+detection on large boards cheap. It's not part of the position itself,
+so it doesn't affect equality.
+"""
+@dataclass(frozen=True, slots=True)
 class GameState:
     grid: Grid
     starting_mark: Mark = Mark("X") # default value of Mark("X") for the starting player’s mark
+    last_index: int | None = field(default=None, compare=False, repr=False)
+
+    _current_mark: Mark = _cache()
+    _game_not_started: bool = _cache()
+    _game_over: bool = _cache()
+    _tie: bool = _cache()
+    _winner: Mark | None = _cache()
+    _winning_cells: list[int] = _cache()
+    _possible_moves: PossibleMoves = _cache()
+    _analysis: LineAnalysis = _cache()
 
     def __post_init__(self) -> None:
         validate_game_state(self)
 
+    """
+    the counterpart of Grid._trusted() for game states produced by moves
+    """
+    @classmethod
+    def _trusted(
+        cls, grid: Grid, starting_mark: Mark, last_index: int | None = None
+    ) -> "GameState":
+        game_state = object.__new__(cls)
+        object.__setattr__(game_state, "grid", grid)
+        object.__setattr__(game_state, "starting_mark", starting_mark)
+        object.__setattr__(game_state, "last_index", last_index)
+        return game_state
+
+    def __reduce__(self) -> tuple:
+        return GameState, (self.grid, self.starting_mark, self.last_index)
+
     """
     The current player’s mark will be the same as the starting player’s 
     mark when the grid is empty or when both players have marked an equal
@@ -107,7 +459,7 @@ class GameState:
     marks in the grid. To determine the other player’s mark, you can take
     advantage of your .other property in the Mark enum.
     """
-    @cached_property
+    @cached_slot
     def current_mark(self) -> Mark:
         if self.grid.x_count == self.grid.o_count:
             return self.starting_mark
@@ -117,65 +469,74 @@ class GameState:
     """
     evaluating the current state of the game.
     """ 
-    @cached_property
+    @cached_slot
     def game_not_started(self) -> bool:
-        return self.grid.empty_count == 9
+        return self.grid.empty_count == self.grid.geometry.size
     
     """
     Conversely, you can conclude that the game has finished when there’s 
     a clear winner or there’s a tie
     """
-    @cached_property
+    @cached_slot
     def game_over(self) -> bool:
         return self.winner is not None or self.tie
     
     """
     Tie Case
     """
-    @cached_property
+    @cached_slot
     def tie(self) -> bool:
         return self.winner is None and self.grid.empty_count == 0
     
     """
     Winner Case
     """
-    @cached_property
+    @cached_slot
     def winner(self) -> Mark | None:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return mark
-        return None
+        if self.last_index is None:
+            return self.analysis.winner
+        return self.grid.bitboard.winner_through(self.last_index)
     
     """
     also want to know the matched winning cells to differentiate them 
-    visually. In this case, you can add a similar property, which uses a 
-    list comprehension to return a list of integer indices of the winning 
-    cells.
+    visually. In this case, you can add a similar property, which returns
+    a list of integer indices of the winning cells.
     """
-    @cached_property
+    @cached_slot
     def winning_cells(self) -> list[int]:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return [
-                        match.start()
-                        for match in re.finditer(r"\?", pattern)
-                    ]
-        return []
+        return self.analysis.winning_cells
+
+    """
+    the empty cells, where either player would complete a line right
+    away, which come for free with the analysis of the winning cells
+    """
+    @property
+    def threats(self) -> tuple[Threat, ...]:
+        return self.analysis.threats
+
+    @cached_slot
+    def analysis(self) -> LineAnalysis:
+        return self.grid.bitboard.analyze()
     
     """
-    a fixed list of possible moves, which you can find by filling the 
+    a fixed sequence of possible moves, which you can find by filling the 
     remaining empty cells in the grid with the current player’s mark
     """
-    @cached_property
-    def possible_moves(self) -> list[Move]:
-        moves = []
-        if not self.game_over:
-            for match in re.finditer(r"\s", self.grid.cells):
-                moves.append(self.make_move_to(match.start()))
-        return moves
+    @cached_slot
+    def possible_moves(self) -> PossibleMoves:
+        if self.game_over:
+            return PossibleMoves(self, [])
+        return PossibleMoves(self, self.grid.bitboard.empty_indices)
     
+    """
+    Drop the cached possible moves, for example, once a search has scored
+    this position for good. Game states are shared through the pool, so
+    otherwise their moves would stay in memory for as long as the states.
+    They're created again the next time someone asks for them.
+    """
+    def release_moves(self) -> None:
+        GameState.possible_moves.forget(self)
+
     def make_random_move(self) -> Move | None:
         try:
             return random.choice(self.possible_moves)
@@ -183,20 +544,16 @@ class GameState:
             return None
     
     def make_move_to(self, index: int) -> Move:
+        if self.game_over:
+            raise InvalidMove("Game is over")
+        if not 0 <= index < self.grid.geometry.size:
+            raise InvalidMove("Cell is out of range")
         if self.grid.cells[index] != " ":
             raise InvalidMove("Cell is not empty")
         return Move(
             mark=self.current_mark,
             cell_index=index,
             before_state=self,
-            after_state=GameState(
-                Grid(
-                    self.grid.cells[:index]
-                    + self.current_mark
-                    + self.grid.cells[index + 1:]
-                ),
-                self.starting_mark,
-            ),
         )
     
     # Minimax algorithm evaluation
@@ -208,4 +565,37 @@ class GameState:
                 return 1
             else:
                 return -1
-        raise UnknownGameScore("Game is not over yet")
\ No newline at end of file
+        raise UnknownGameScore("Game is not over yet")
+
+"""
+A flyweight pool of game states derived from moves, keyed by the cells
+and the starting mark. Every transposition of the same position resolves
+to a single GameState instance, so its cached properties are computed
+only once per process. The pool forgets the least recently used states
+beyond .maxsize, and a .maxsize of zero turns interning off.
+"""
+class GameStatePool(LRUCache[tuple[str, Mark, Geometry], GameState]):
+    def __init__(self, maxsize: int | None = 50_000) -> None:
+        super().__init__(maxsize)
+
+    """
+    Any line completed by the last move passes through its cell, no matter
+    the path that led to the position, so a pooled state remains correct
+    even when it's reached with a different .last_index.
+    """
+    def get(
+        self,
+        cells: str,
+        starting_mark: Mark,
+        geometry: Geometry = CLASSIC,
+        last_index: int | None = None,
+    ) -> GameState:
+        key = (cells, starting_mark, geometry)
+        if (game_state := self._lookup(key)) is None:
+            game_state = GameState._trusted(
+                Grid._trusted(cells, geometry), starting_mark, last_index
+            )
+            self._store(key, game_state)
+        return game_state
+
+game_state_pool = GameStatePool()
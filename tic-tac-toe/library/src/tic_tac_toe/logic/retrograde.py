@@ -0,0 +1,200 @@
+"""
+Solve every position of an m,n,k game at once by retrograde analysis,
+which works backwards from the finished games rather than searching
+forward from each position, so no position is ever expanded twice.
+
+    1. Enumerate the legal positions layer by layer, one layer per number
+       of marks on the grid, starting from the empty grid. Each position
+       is a pair of bitboards, packed into one integer key, and indexed
+       in the order of discovery, so every layer follows the one before.
+    2. Invert the recorded moves into a predecessor graph, stored as two
+       flat arrays, like a compressed sparse row matrix.
+    3. Walk the positions in reverse order of their indices. By the time
+       a position is reached, all of its successors have reported to it,
+       so its value is final, and it passes the value on to each of its
+       predecessors. This takes one pass over the edges of the graph.
+
+The values follow the scale of the analysis module: a position won in d
+moves by the player to move is worth (SCALE - d), a lost position is
+worth -(SCALE - d), and a tie is worth zero. The positions are only the
+ones reachable from the empty grid with the given starting mark, which
+are exactly the grids that pass validate_game_state() and can occur in
+a game. The memory usage grows with the number of those positions, so
+you can cap it with max_positions, and the table reports its size.
+"""
+
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from tic_tac_toe.logic.analysis import step
+from tic_tac_toe.logic.models import CLASSIC, GameState, Geometry, Grid, Mark
+
+class Solution(NamedTuple):
+    score: int
+    depth: int
+
+"""
+The value of every legal position of one geometry and starting mark,
+along with the statistics of how the table was built. Look positions up
+with .lookup() or .best_moves() using game states.
+"""
+@dataclass(frozen=True)
+class RetrogradeTable:
+    geometry: Geometry
+    starting_mark: Mark
+    index: dict[int, int] = field(repr=False)
+    values: array = field(repr=False)
+    edges: int
+    build_time: float
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    """
+    an estimate of the memory taken by the position index and the values,
+    excluding the predecessor graph, which is discarded after the build
+    """
+    @property
+    def nbytes(self) -> int:
+        keys = sum(sys.getsizeof(key) for key in self.index)
+        values = self.values.itemsize * len(self.values)
+        return sys.getsizeof(self.index) + keys + values
+
+    def lookup(self, game_state: GameState) -> Solution | None:
+        if (
+            game_state.grid.geometry != self.geometry
+            or game_state.starting_mark is not self.starting_mark
+        ):
+            return None
+        bitboard = game_state.grid.bitboard
+        key = pack(bitboard.crosses, bitboard.naughts, self.geometry)
+        if (position := self.index.get(key)) is None:
+            return None
+        value = self.values[position]
+        if value == 0:
+            return Solution(0, game_state.grid.empty_count)
+        return Solution(1 if value > 0 else -1, self.geometry.size + 1 - abs(value))
+
+    """
+    the cells of all the moves that keep the value of the position, which
+    means the fastest win, the slowest loss, or any move that holds a tie
+    """
+    def best_moves(self, game_state: GameState) -> tuple[int, ...]:
+        if self.lookup(game_state) is None:
+            return ()
+        bitboard = game_state.grid.bitboard
+        value = self.values[
+            self.index[pack(bitboard.crosses, bitboard.naughts, self.geometry)]
+        ]
+        best = []
+        for move in game_state.possible_moves:
+            after = move.after_state.grid.bitboard
+            child = self.index[pack(after.crosses, after.naughts, self.geometry)]
+            if -step(self.values[child]) == value:
+                best.append(move.cell_index)
+        return tuple(best)
+
+def pack(crosses: int, naughts: int, geometry: Geometry) -> int:
+    return crosses | naughts << geometry.size
+
+def solve(
+    geometry: Geometry = CLASSIC,
+    starting_mark: Mark = Mark("X"),
+    max_positions: int | None = None,
+) -> RetrogradeTable:
+    start = time.perf_counter()
+    size = geometry.size
+    scale = size + 1
+    full = geometry.full_mask
+
+    # 1. forward enumeration, recording the moves as (parent, child) edges
+    keys = [0]
+    index = {0: 0}
+    terminal = bytearray(1)  # 0 for an ongoing game, 1 for a win, 2 for a tie
+    parents, children = array("L"), array("L")
+    layer_start = 0
+    for marks in range(size):
+        mover_is_x = (marks % 2 == 0) == (starting_mark is Mark.CROSS)
+        layer_end = len(keys)
+        for parent in range(layer_start, layer_end):
+            if terminal[parent]:
+                continue
+            key = keys[parent]
+            crosses, naughts = key & full, key >> size
+            own = crosses if mover_is_x else naughts
+            empty = full & ~(crosses | naughts)
+            while empty:
+                bit = empty & -empty
+                empty ^= bit
+                child_key = key | (bit if mover_is_x else bit << size)
+                child = index.get(child_key)
+                if child is None:
+                    child = index[child_key] = len(keys)
+                    keys.append(child_key)
+                    placed = own | bit
+                    if any(
+                        placed & mask == mask
+                        for mask in geometry.masks_through[bit.bit_length() - 1]
+                    ):
+                        terminal.append(1)
+                    else:
+                        terminal.append(2 if marks + 1 == size else 0)
+                    if max_positions is not None and len(keys) > max_positions:
+                        raise ValueError(f"More than {max_positions} positions")
+                parents.append(parent)
+                children.append(child)
+        layer_start = layer_end
+    count = len(keys)
+    del keys
+
+    # 2. the predecessor graph, with the parents grouped by child
+    offsets = array("L", [0]) * (count + 1)
+    for child in children:
+        offsets[child + 1] += 1
+    for position in range(count):
+        offsets[position + 1] += offsets[position]
+    predecessors = array("L", parents)
+    cursor = array("L", offsets)
+    for parent, child in zip(parents, children):
+        predecessors[cursor[child]] = parent
+        cursor[child] += 1
+    del parents, children, cursor
+
+    # 3. backward propagation, from the fullest layer to the empty grid
+    values = array("h", [-scale]) * count
+    for position in range(count - 1, -1, -1):
+        if terminal[position] == 1:
+            value = -scale  # the opponent has just won
+        elif terminal[position] == 2:
+            value = 0
+        else:
+            value = values[position]  # the best of what the successors reported
+        values[position] = value
+        reported = -step(value)
+        for edge in range(offsets[position], offsets[position + 1]):
+            parent = predecessors[edge]
+            if reported > values[parent]:
+                values[parent] = reported
+
+    return RetrogradeTable(
+        geometry,
+        starting_mark,
+        index,
+        values,
+        len(predecessors),
+        time.perf_counter() - start,
+    )
+
+if __name__ == "__main__":
+    rows, columns, win_length = (int(arg) for arg in (sys.argv[1:] or ["3", "3", "3"]))
+    geometry = Geometry(rows, columns, win_length)
+    table = solve(geometry)
+    print(
+        f"{rows}x{columns}, {win_length} in a row: {len(table)} positions, "
+        f"{table.edges} moves, {table.nbytes / 1024:.0f} KiB, "
+        f"built in {table.build_time:.2f}s"
+    )
+    print("Empty grid:", table.lookup(GameState(Grid.blank(geometry))))
@@ -0,0 +1,172 @@
+"""
+Tic-tac-toe has only a few thousand legal positions, so rather than
+searching the game tree at runtime, you can solve every position once
+and store the answers in a flat binary file:
+
+    header:  magic (4s) | version (H) | record size (H) | record count (I)
+    records: score (b)  | best moves bitmask (H), one per position index
+
+A position index is the grid's cells read as a base-3 number, where an
+empty cell is 0, the starting player's mark is 1, and the other mark is
+2. Scores are given from the perspective of the player about to move.
+Because the file is memory-mapped read-only, every process that loads
+it shares the same physical pages through the operating system's cache.
+By default, the table lives in the user's cache directory, where it's
+built the first time it's needed.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+from tic_tac_toe.logic.models import CLASSIC, GameState, Grid, Mark, Move
+from tic_tac_toe.logic.minimax import minimax
+
+MAGIC = b"TTTS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<bH")
+NUM_POSITIONS = 3 ** 9
+UNKNOWN_SCORE = 127
+
+def cache_directory() -> Path:
+    if sys.platform == "win32" and "LOCALAPPDATA" in os.environ:
+        return Path(os.environ["LOCALAPPDATA"]) / "tic-tac-toe"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "tic-tac-toe"
+
+DEFAULT_PATH = cache_directory() / "solved_table.bin"
+
+# map the cells onto base-3 digits relative to the starting player
+_DIGITS = {
+    Mark.CROSS: str.maketrans(" XO", "012"),
+    Mark.NAUGHT: str.maketrans(" OX", "012"),
+}
+
+class Entry(NamedTuple):
+    score: int
+    best_moves: tuple[int, ...]
+
+def position_index(game_state: GameState) -> int:
+    if game_state.grid.geometry != CLASSIC:
+        raise ValueError("Only the classic 3x3 grid can be looked up")
+    return int(game_state.grid.cells.translate(_DIGITS[game_state.starting_mark]), 3)
+
+"""
+visit every position reachable from the empty grid exactly once, which
+is the same as enumerating all legal game states with the given starting
+mark, crosses by default
+"""
+def legal_game_states(starting_mark: Mark = Mark.CROSS) -> list[GameState]:
+    seen = set()
+    stack = [GameState(Grid(), starting_mark)]
+    game_states = []
+    while stack:
+        game_state = stack.pop()
+        if game_state.grid.cells in seen:
+            continue
+        seen.add(game_state.grid.cells)
+        game_states.append(game_state)
+        stack.extend(move.after_state for move in game_state.possible_moves)
+    return game_states
+
+def solve(game_state: GameState) -> Entry:
+    if game_state.game_over:
+        return Entry(game_state.evaluate_score(game_state.current_mark), ())
+    scores = {
+        move.cell_index: minimax(move, maximizer=game_state.current_mark)
+        for move in game_state.possible_moves
+    }
+    best_score = max(scores.values())
+    return Entry(
+        best_score,
+        tuple(index for index, score in scores.items() if score == best_score),
+    )
+
+"""
+The table is written to a temporary file next to its destination, which
+then replaces the destination at once, so concurrent builds never see,
+or leave behind, a partially written table.
+"""
+def build_table(path: Path | str = DEFAULT_PATH) -> Path:
+    buffer = bytearray(HEADER.size + NUM_POSITIONS * RECORD.size)
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, RECORD.size, NUM_POSITIONS)
+    for index in range(NUM_POSITIONS):
+        RECORD.pack_into(buffer, HEADER.size + index * RECORD.size, UNKNOWN_SCORE, 0)
+    for game_state in legal_game_states():
+        entry = solve(game_state)
+        mask = sum(1 << index for index in entry.best_moves)
+        offset = HEADER.size + position_index(game_state) * RECORD.size
+        RECORD.pack_into(buffer, offset, entry.score, mask)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as temporary:
+        temporary.write(buffer)
+    try:
+        os.chmod(temporary.name, 0o644)  # temporary files are private to the user
+        os.replace(temporary.name, path)
+    except OSError:
+        os.unlink(temporary.name)
+        raise
+    return path
+
+class SolvedTable:
+    def __init__(self, path: Path | str = DEFAULT_PATH) -> None:
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = HEADER.unpack_from(self._buffer)
+        if (magic, version, record_size, count) != (
+            MAGIC, VERSION, RECORD.size, NUM_POSITIONS
+        ):
+            self.close()
+            raise ValueError(f"Not a solved table: {path}")
+
+    def __enter__(self) -> "SolvedTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def lookup(self, game_state: GameState) -> Entry | None:
+        if game_state.grid.geometry != CLASSIC:
+            return None
+        offset = HEADER.size + position_index(game_state) * RECORD.size
+        score, mask = RECORD.unpack_from(self._buffer, offset)
+        if score == UNKNOWN_SCORE:
+            return None
+        return Entry(score, tuple(i for i in range(9) if mask >> i & 1))
+
+    """
+    pick the lowest cell index among the best moves, which agrees with
+    the tie-breaking of find_best_move()
+    """
+    def best_move(self, game_state: GameState) -> Move | None:
+        if entry := self.lookup(game_state):
+            if entry.best_moves:
+                return game_state.make_move_to(entry.best_moves[0])
+        return None
+
+_loaded_tables: dict[Path, SolvedTable] = {}
+
+"""
+open the table once per process, building it first if it doesn't exist
+"""
+def load_table(path: Path | str = DEFAULT_PATH) -> SolvedTable:
+    path = Path(path).resolve()
+    if path not in _loaded_tables:
+        if not path.exists():
+            build_table(path)
+        _loaded_tables[path] = SolvedTable(path)
+    return _loaded_tables[path]
+
+if __name__ == "__main__":
+    print(build_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH))
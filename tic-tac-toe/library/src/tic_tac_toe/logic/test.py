@@ -85,4 +85,15 @@ for move in game_state.possible_moves:
 computed scores correspond to the edge weights in the game tree that we 
 saw before. Finding the best move is only a matter of choosing the one 
 with the highest resulting score.
-"""
\ No newline at end of file
+"""
+
+# scoring all moves at once, along with how fast each game ends
+from tic_tac_toe.logic import analyze
+
+for analysis in analyze(game_state):
+    print(
+        "Cell:", analysis.move.cell_index,
+        "Score:", analysis.score,
+        "Depth:", analysis.depth,
+        "Line:", analysis.principal_variation,
+    )
\ No newline at end of file
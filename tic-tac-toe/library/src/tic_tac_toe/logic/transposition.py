@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Generic, Hashable, NamedTuple, TypeVar
+
+"""
+The symmetries of a board expressed as permutations of cell indices.
+Applying a permutation to a row-major string of cells yields the cells
+of the transformed board. A square board has eight of them (four
+rotations, each with and without a mirror reflection), while other
+rectangles only keep the identity, both mirrors, and the half turn.
+"""
+@lru_cache(maxsize=None)
+def symmetries(rows: int = 3, columns: int = 3) -> tuple[tuple[int, ...], ...]:
+    transforms = [
+        lambda r, c: (r, c),  # identity
+        lambda r, c: (r, columns - 1 - c),  # mirror left-right
+        lambda r, c: (rows - 1 - r, c),  # mirror top-bottom
+        lambda r, c: (rows - 1 - r, columns - 1 - c),  # rotate 180°
+    ]
+    if rows == columns:
+        transforms += [
+            lambda r, c: (c, r),  # transpose
+            lambda r, c: (columns - 1 - c, r),  # rotate 90°
+            lambda r, c: (c, rows - 1 - r),  # rotate 270°
+            lambda r, c: (columns - 1 - c, rows - 1 - r),  # anti-transpose
+        ]
+    return tuple(
+        tuple(
+            source_row * columns + source_column
+            for row in range(rows)
+            for column in range(columns)
+            for source_row, source_column in [transform(row, column)]
+        )
+        for transform in transforms
+    )
+
+"""
+fold all equivalent boards into one representative by picking the
+lexicographically smallest transformed string of cells
+"""
+def canonical_cells(cells: str, rows: int = 3, columns: int = 3) -> str:
+    return min(
+        "".join([cells[i] for i in permutation])
+        for permutation in symmetries(rows, columns)
+    )
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+"""
+The bookkeeping shared by the bounded caches: an ordered mapping that
+evicts the least recently used entries once it grows beyond .maxsize,
+or never when .maxsize is None, and the hit and miss counters, which
+mimic the cache_info() of functools.lru_cache, so you can monitor the
+cache's efficiency at runtime. Subclasses look entries up and store them
+with ._lookup() and ._store(), and can't store None as a value.
+
+The caches are shared by the searches running in different threads, so
+every change to the mapping is a single call, which is atomic, and an
+entry evicted by another thread in the meantime just counts as a miss.
+The counters may lose an update under contention, but never the entries.
+"""
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int | None) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("Cache size must not be negative")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def maxsize(self) -> int | None:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int | None) -> None:
+        if value is not None and value < 0:
+            raise ValueError("Cache size must not be negative")
+        self._maxsize = value
+        self._evict()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self))
+
+    def _lookup(self, key: K) -> V | None:
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries[key] = value  # back in as the most recently used
+        self.hits += 1
+        return value
+
+    def _store(self, key: K, value: V) -> None:
+        if self._maxsize == 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        self._evict()
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._entries) > self._maxsize:
+                try:
+                    self._entries.popitem(last=False)
+                except KeyError:
+                    break  # emptied by another thread
+
+"""
+A bounded mapping from search keys to scores, which evicts the least
+recently used entry once it grows beyond .maxsize. Setting .maxsize to
+None makes the table unbounded.
+"""
+class TranspositionTable(LRUCache[Hashable, int]):
+    def __init__(self, maxsize: int | None = 100_000) -> None:
+        super().__init__(maxsize)
+
+    def get(self, key: Hashable) -> int | None:
+        return self._lookup(key)
+
+    def put(self, key: Hashable, score: int) -> None:
+        self._store(key, score)
@@ -2,31 +2,57 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from tic_tac_toe.game.players import Player
-    from tic_tac_toe.logic.models import Grid, GameState, Mark
+    from tic_tac_toe.logic.models import Geometry, Grid, GameState, Mark
 """
 You import Grid conditionally. The TYPE_CHECKING constant is false at 
 runtime, but third-party tools, such as mypy, will pretend it’s true 
 when performing static type checking to allow the import statement to 
 run.
 """
-import re
 # from models import Grid # causes error due to circular import
 
 from tic_tac_toe.logic.exceptions import InvalidGameState
 
+VALID_CELLS = frozenset("XO ")
 
 
+"""
+a board needs at least one line of the winning length to fit on it
+"""
+def validate_geometry(geometry: Geometry) -> None:
+    if geometry.rows < 1 or geometry.columns < 1:
+        raise ValueError("The grid must have at least one row and column")
+    if not 1 <= geometry.win_length <= max(geometry.rows, geometry.columns):
+        raise ValueError("Win length must fit on the grid")
+
 def validate_grid(grid:Grid) -> None:
-        if not re.match(r"^[\sXO]{9}$", grid.cells):
-            raise ValueError("Must contain 9 cells of: X, O, or space")
+        size = grid.geometry.size
+        if len(grid.cells) != size or not VALID_CELLS.issuperset(grid.cells):
+            raise ValueError(f"Must contain {size} cells of: X, O, or space")
         
 def validate_game_state(game_state: GameState) -> None:
     validate_number_of_marks(game_state.grid)
     validate_starting_mark(game_state.grid, game_state.starting_mark)
+    validate_last_index(game_state)
     validate_winner(
         game_state.grid, game_state.starting_mark, game_state.winner
     )
 
+"""
+the most recently placed mark must belong to the player who just moved,
+and any winning line must pass through it, or else the winner found by
+looking at the lines through that cell alone would be wrong
+"""
+def validate_last_index(game_state: GameState) -> None:
+    if game_state.last_index is not None:
+        if not 0 <= game_state.last_index < len(game_state.grid.cells):
+            raise InvalidGameState("Last move is outside of the grid")
+        if game_state.grid.cells[game_state.last_index] != game_state.current_mark.other:
+            raise InvalidGameState("Wrong mark at the last move")
+        bitboard = game_state.grid.bitboard
+        if bitboard.winner_through(game_state.last_index) != bitboard.winner:
+            raise InvalidGameState("The winning line misses the last move")
+
 """
 marks left by one player must be either the same or greater by exactly 
 one compared to the number of marks left by the other player.
@@ -0,0 +1,37 @@
+import unittest
+
+from tic_tac_toe.logic.analysis import analyze, find_fastest_move, negamax
+from tic_tac_toe.logic.minimax import minimax
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.solved_table import legal_game_states
+
+class TestNegamax(unittest.TestCase):
+    def test_agrees_with_minimax_on_every_reachable_state(self):
+        game_states = legal_game_states(Mark.CROSS) + legal_game_states(Mark.NAUGHT)
+        self.assertEqual(len(game_states), 10_956)
+        for game_state in game_states:
+            if game_state.game_over:
+                self.assertEqual(negamax(game_state) < 0, game_state.winner is not None)
+                self.assertEqual(analyze(game_state), [])
+                continue
+            scores = {
+                move.cell_index: minimax(move, maximizer=game_state.current_mark)
+                for move in game_state.possible_moves
+            }
+            for analysis in analyze(game_state):
+                self.assertEqual(
+                    analysis.score, scores[analysis.move.cell_index], game_state
+                )
+                # the principal variation plays the game out to its end
+                self.assertEqual(len(analysis.principal_variation), analysis.depth)
+                after = game_state
+                for index in analysis.principal_variation:
+                    after = after.make_move_to(index).after_state
+                self.assertTrue(after.game_over)
+            fastest = find_fastest_move(game_state)
+            self.assertEqual(
+                scores[fastest.cell_index], max(scores.values()), game_state
+            )
+
+if __name__ == "__main__":
+    unittest.main()
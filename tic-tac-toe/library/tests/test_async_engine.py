@@ -0,0 +1,191 @@
+import asyncio
+import json
+import sys
+import unittest
+from functools import partial
+
+from tic_tac_toe.game.async_engine import (
+    AsyncComputerPlayer,
+    AsyncNullRenderer,
+    AsyncTicTacToe,
+    SessionManager,
+)
+from tic_tac_toe.game.players import ComputerPlayer, MinimaxComputerPlayer
+from tic_tac_toe.logic import minimax
+from tic_tac_toe.logic.models import (
+    GameState,
+    Geometry,
+    Mark,
+    Move,
+    game_state_pool,
+)
+
+"""
+always marks the first empty cell, so that the games are predictable,
+and remembers whether it was closed
+"""
+class FirstEmptyCellPlayer(ComputerPlayer):
+    instances: list["FirstEmptyCellPlayer"] = []
+
+    def __init__(self, mark: Mark) -> None:
+        super().__init__(mark, delay_seconds=0)
+        self.closed = False
+        self.instances.append(self)
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return game_state.make_move_to(game_state.grid.cells.index(" "))
+
+    def close(self) -> None:
+        self.closed = True
+
+class TestServe(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        FirstEmptyCellPlayer.instances = []
+        self.manager = SessionManager()
+        self.server = await self.manager.serve(FirstEmptyCellPlayer)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    """
+    play one game over a connection, answering each state with the next
+    of the given lines, and return every document sent by the server
+    """
+    async def play(self, *lines: str) -> list[dict]:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        answers = iter(lines)
+        documents = []
+        try:
+            while line := await reader.readline():
+                document = json.loads(line)
+                documents.append(document)
+                if "winner" in document:
+                    break
+                if "mark" in document:
+                    writer.write(next(answers).encode("utf-8") + b"\n")
+                    await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        return documents
+
+    async def wait_for_sessions(self) -> None:
+        while self.manager.active:
+            await asyncio.sleep(0.01)
+
+    async def test_client_wins(self):
+        documents = await self.play("0", "3", "6")
+        self.assertEqual(
+            documents[-1],
+            {
+                "cells": "XOOX  X  ",
+                "rows": 3,
+                "columns": 3,
+                "win_length": 3,
+                "winner": "X",
+                "tie": False,
+            },
+        )
+        self.assertEqual([d["mark"] for d in documents[:-1]], ["X"] * 3)
+
+    async def test_client_loses(self):
+        documents = await self.play("8", "7", "5")
+        self.assertEqual(documents[-1]["cells"], "OOO  X XX")
+        self.assertEqual(documents[-1]["winner"], "O")
+
+    async def test_invalid_moves_get_error_replies(self):
+        documents = await self.play("9", "-1", "four", "", "0", "1", "3", "6")
+        errors = [d["error"] for d in documents if "error" in d]
+        self.assertEqual(
+            errors,
+            [
+                "Cell is out of range",
+                "Cell is out of range",
+                "Expected a cell index",
+                "Expected a cell index",
+                "Cell is not empty",
+            ],
+        )
+        self.assertEqual(documents[-1]["winner"], "X")
+        self.assertEqual(documents[-1]["cells"], "XOOX  X  ")
+
+    async def test_opponent_is_closed_after_the_game(self):
+        await self.play("0", "3", "6")
+        await self.wait_for_sessions()
+        self.assertEqual(len(FirstEmptyCellPlayer.instances), 1)
+        self.assertTrue(FirstEmptyCellPlayer.instances[0].closed)
+
+    async def test_disconnect_ends_the_session(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        document = json.loads(await reader.readline())
+        self.assertEqual(document["cells"], " " * 9)
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.wait_for(self.wait_for_sessions(), timeout=1.0)
+        self.assertTrue(FirstEmptyCellPlayer.instances[0].closed)
+        documents = await self.play("0", "3", "6")
+        self.assertEqual(documents[-1]["winner"], "X")
+
+    async def test_concurrent_games(self):
+        results = await asyncio.gather(
+            *(self.play("0", "3", "6") for _ in range(10)),
+            *(self.play("8", "7", "5") for _ in range(10)),
+        )
+        winners = [documents[-1]["winner"] for documents in results]
+        self.assertEqual(winners, ["X"] * 10 + ["O"] * 10)
+        await self.wait_for_sessions()
+        self.assertTrue(all(p.closed for p in FirstEmptyCellPlayer.instances))
+
+class TestSessionManager(unittest.IsolatedAsyncioTestCase):
+    def game(self, player1: ComputerPlayer, player2: ComputerPlayer):
+        return AsyncTicTacToe(
+            AsyncComputerPlayer(player1),
+            AsyncComputerPlayer(player2),
+            AsyncNullRenderer(),
+        )
+
+    async def test_perfect_play_ties(self):
+        manager = SessionManager(max_sessions=2)
+        minimax = partial(MinimaxComputerPlayer, delay_seconds=0)
+        games = [self.game(minimax(Mark("X")), minimax(Mark("O"))) for _ in range(4)]
+        results = await manager.run(games)
+        self.assertTrue(all(game_state.tie for game_state in results))
+        self.assertEqual(manager.active, 0)
+
+    """
+    the searches of concurrent sessions run in the default thread pool and
+    share the module-level caches, which are kept small here to make them
+    evict the entries that the other threads are looking up
+    """
+    async def test_concurrent_sessions_share_the_caches(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        for cache in (game_state_pool, minimax.transposition_table):
+            self.addCleanup(setattr, cache, "maxsize", cache.maxsize)
+            cache.maxsize = 200
+        manager = SessionManager()
+        players = [
+            partial(MinimaxComputerPlayer, delay_seconds=0),
+            partial(MinimaxComputerPlayer, delay_seconds=0, search="alphabeta"),
+        ]
+        games = [
+            self.game(players[i % 2](Mark("X")), players[i // 2 % 2](Mark("O")))
+            for i in range(8)
+        ]
+        results = await manager.run(games)
+        self.assertTrue(all(game_state.tie for game_state in results))
+
+    async def test_starting_mark_and_geometry(self):
+        manager = SessionManager()
+        game = self.game(
+            FirstEmptyCellPlayer(Mark("X")), FirstEmptyCellPlayer(Mark("O"))
+        )
+        [game_state] = await manager.run([game], Mark("O"), Geometry(3, 4, 3))
+        self.assertEqual(game_state.grid.cells, "OXOXOXOXO   ")
+        self.assertEqual(game_state.winner, Mark("O"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from tic_tac_toe.logic.exceptions import InvalidGameState
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+class TestLastIndex(unittest.TestCase):
+    def test_winning_line_must_pass_through_the_last_move(self):
+        with self.assertRaisesRegex(InvalidGameState, "misses the last move"):
+            GameState(Grid("XXXOO X O"), Mark.CROSS, last_index=6)
+
+    def test_last_move_on_the_winning_line(self):
+        for last_index in (0, 1, 2):
+            with self.subTest(last_index=last_index):
+                game_state = GameState(Grid("XXXOO X O"), Mark.CROSS, last_index)
+                self.assertIs(game_state.winner, Mark.CROSS)
+                self.assertTrue(game_state.game_over)
+                self.assertEqual(len(game_state.possible_moves), 0)
+
+    def test_ongoing_game(self):
+        game_state = GameState(Grid("XO  X   O"), Mark.CROSS, last_index=8)
+        self.assertIsNone(game_state.winner)
+        self.assertFalse(game_state.game_over)
+        self.assertEqual(len(game_state.possible_moves), 5)
+
+    def test_wrong_mark_or_cell(self):
+        with self.assertRaisesRegex(InvalidGameState, "Wrong mark"):
+            GameState(Grid("XXXOO X O"), Mark.CROSS, last_index=3)
+        with self.assertRaisesRegex(InvalidGameState, "outside of the grid"):
+            GameState(Grid("XXXOO X O"), Mark.CROSS, last_index=9)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from tic_tac_toe.game.records import (
+    GameRecord,
+    GameRecordReader,
+    GameRecordWriter,
+    iter_records,
+)
+from tic_tac_toe.logic.models import Geometry, Mark
+
+RECORD = GameRecord(
+    Mark.CROSS, Geometry(3, 3, 3), "minimax", "random", bytes([4, 0, 8])
+)
+
+class TestRecords(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "games.bin"
+
+    def write(self, *records: GameRecord) -> None:
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+
+    def test_round_trip_and_append(self):
+        self.write(RECORD)
+        other = GameRecord(Mark.NAUGHT, Geometry(4, 4, 3), "", "mcts", bytes([15]))
+        self.write(other)
+        self.assertEqual(list(iter_records(self.path)), [RECORD, other])
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(reader[1], other)
+
+    def test_long_names_are_cut_between_characters(self):
+        name = "é" * 200  # two bytes each, so byte 255 is in the middle of one
+        record = GameRecord(Mark.CROSS, Geometry(3, 3, 3), name, "x" * 300, b"")
+        self.write(record)
+        [read] = iter_records(self.path)
+        self.assertEqual(read.player_x, "é" * 127)
+        self.assertEqual(read.player_o, "x" * 255)
+
+    def test_appending_checks_the_header(self):
+        self.path.write_bytes(b"something else entirely")
+        with self.assertRaisesRegex(ValueError, "Not a file of game records"):
+            GameRecordWriter(self.path)
+        self.assertEqual(self.path.read_bytes(), b"something else entirely")
+
+    def test_truncated_record(self):
+        self.write(RECORD, RECORD)
+        data = self.path.read_bytes()
+        for cut in (1, 5, len(RECORD.to_bytes()) - 1):
+            with self.subTest(cut=cut):
+                self.path.write_bytes(data[:-cut])
+                with self.assertRaisesRegex(ValueError, "Truncated"):
+                    list(iter_records(self.path))
+                with self.assertRaisesRegex(ValueError, "Truncated"):
+                    GameRecordReader(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,321 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TextIO
+
+from tic_tac_toe.game.players import SubprocessPlayer
+from tic_tac_toe.game.remote import (
+    RemoteEngine,
+    position_from_json,
+    position_to_json,
+    serve,
+    socket_server,
+)
+from tic_tac_toe.logic import minimax
+from tic_tac_toe.logic.exceptions import EngineError, EngineTimeout
+from tic_tac_toe.logic.models import (
+    GameState,
+    Geometry,
+    Grid,
+    Mark,
+    Move,
+    game_state_pool,
+)
+
+def pipe() -> tuple[TextIO, TextIO]:
+    read_fd, write_fd = os.pipe()
+    return (
+        open(read_fd, "r", encoding="utf-8"),
+        open(write_fd, "w", encoding="utf-8"),
+    )
+
+def first_empty_cell(game_state: GameState) -> Move | None:
+    return game_state.make_move_to(game_state.grid.cells.index(" "))
+
+"""
+An engine running in a thread of the test process, talking to the client
+over a pair of pipes. The handler gets each request and writes whatever
+it likes in response, so it can misbehave on purpose.
+"""
+class StubEngine:
+    def __init__(self, handler: Callable[[dict, TextIO], None]) -> None:
+        self.handler = handler
+        engine_reader, client_writer = pipe()
+        client_reader, self.writer = pipe()
+        self.engine = RemoteEngine(client_reader, client_writer, timeout=1.0)
+        self.thread = threading.Thread(
+            target=self._run, args=(engine_reader,), daemon=True
+        )
+        self.thread.start()
+
+    def _run(self, reader: TextIO) -> None:
+        with reader, self.writer:
+            for line in reader:
+                request = json.loads(line)
+                self.handler(request, self.writer)
+                if self.writer.closed:
+                    return
+                self.writer.flush()
+
+def answer(request: dict, writer: TextIO) -> None:
+    moves = []
+    for document in request["positions"]:
+        game_state = position_from_json(document)
+        move = None if game_state.game_over else first_empty_cell(game_state)
+        moves.append(None if move is None else move.cell_index)
+    writer.write(json.dumps({"id": request["id"], "moves": moves}) + "\n")
+
+def reply(document: dict) -> Callable[[dict, TextIO], None]:
+    def handler(request: dict, writer: TextIO) -> None:
+        writer.write(json.dumps({"id": request["id"]} | document) + "\n")
+    return handler
+
+class TestServe(unittest.TestCase):
+    def serve(self, *lines: str) -> list[dict]:
+        request_reader, request_writer = pipe()
+        response_reader, response_writer = pipe()
+        with request_writer:
+            request_writer.write("".join(line + "\n" for line in lines))
+        with request_reader, response_writer:
+            serve(first_empty_cell, request_reader, response_writer)
+        with response_reader:
+            return [json.loads(line) for line in response_reader]
+
+    def test_answers_a_batch_in_order(self):
+        positions = [
+            position_to_json(GameState(Grid("X   O    "))),
+            position_to_json(GameState(Grid("XXXOO    "))),
+            position_to_json(GameState(Grid("XO       "))),
+        ]
+        responses = self.serve(json.dumps({"id": 7, "positions": positions}))
+        self.assertEqual(responses, [{"id": 7, "moves": [1, None, 2]}])
+
+    def test_answers_other_geometries(self):
+        geometry = Geometry(4, 4, 3)
+        position = position_to_json(GameState(Grid.blank(geometry), Mark("O")))
+        responses = self.serve(json.dumps({"id": 1, "positions": [position]}))
+        self.assertEqual(responses, [{"id": 1, "moves": [0]}])
+
+    def test_invalid_position_fails_the_request(self):
+        positions = [
+            position_to_json(GameState(Grid())),
+            {"cells": "XXXXXXXXX", "rows": 3, "columns": 3,
+             "win_length": 3, "starting": "X"},
+        ]
+        responses = self.serve(json.dumps({"id": 3, "positions": positions}))
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0]["id"], 3)
+        self.assertIn("error", responses[0])
+
+    def test_malformed_request_gets_an_error_and_serving_goes_on(self):
+        position = position_to_json(GameState(Grid()))
+        responses = self.serve(
+            "not json",
+            "",
+            json.dumps({"id": 4}),
+            json.dumps({"id": 5, "positions": [position]}),
+        )
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(responses[0]["id"], None)
+        self.assertIn("error", responses[0])
+        self.assertEqual(responses[1]["id"], 4)
+        self.assertIn("error", responses[1])
+        self.assertEqual(responses[2], {"id": 5, "moves": [0]})
+
+class TestRemoteEngine(unittest.TestCase):
+    def stub(self, handler: Callable[[dict, TextIO], None]) -> RemoteEngine:
+        stub = StubEngine(handler)
+        self.addCleanup(stub.engine.close)
+        return stub.engine
+
+    def test_round_trip_through_serve(self):
+        engine_reader, client_writer = pipe()
+        client_reader, engine_writer = pipe()
+        thread = threading.Thread(
+            target=serve, args=(first_empty_cell, engine_reader, engine_writer)
+        )
+        thread.start()
+        with RemoteEngine(client_reader, client_writer, timeout=1.0) as engine:
+            game_state = GameState(Grid("X   O    "))
+            move = engine.get_move(game_state)
+            self.assertEqual(move.cell_index, 1)
+            self.assertEqual(move.after_state.grid.cells, "XX  O    ")
+            self.assertIsNone(engine.get_move(GameState(Grid("XXXOO    "))))
+        thread.join(timeout=1.0)
+        self.assertFalse(thread.is_alive())
+        engine_reader.close()
+        engine_writer.close()
+
+    def test_skips_answers_to_other_requests(self):
+        def handler(request: dict, writer: TextIO) -> None:
+            stale = {"id": request["id"] - 1, "moves": [8]}
+            writer.write(json.dumps(stale) + "\n")
+            writer.write("a diagnostic line\n")
+            writer.write(json.dumps([request["id"]]) + "\n")
+            answer(request, writer)
+        engine = self.stub(handler)
+        self.assertEqual(engine.request([GameState(Grid())]), [0])
+        self.assertEqual(engine.metrics.requests, 1)
+
+    def test_late_answer_is_skipped_by_the_next_request(self):
+        def handler(request: dict, writer: TextIO) -> None:
+            if request["id"] == 1:
+                return  # answered only along with the second request
+            answer({"id": 1, "positions": request["positions"] * 2}, writer)
+            answer(request, writer)
+        engine = self.stub(handler)
+        engine.timeout = 0.1
+        with self.assertRaises(EngineTimeout):
+            engine.request([GameState(Grid())])
+        engine.timeout = 1.0
+        self.assertEqual(engine.request([GameState(Grid("X        "))]), [1])
+        self.assertEqual(engine.metrics.timeouts, 1)
+
+    def test_timeout(self):
+        engine = self.stub(lambda request, writer: None)
+        engine.timeout = 0.1
+        start = time.perf_counter()
+        with self.assertRaises(EngineTimeout):
+            engine.get_move(GameState(Grid()))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(engine.metrics.timeouts, 1)
+        self.assertEqual(engine.metrics.requests, 0)
+
+    def test_engine_exit(self):
+        engine = self.stub(lambda request, writer: writer.close())
+        with self.assertRaisesRegex(EngineError, "closed the connection"):
+            engine.get_move(GameState(Grid()))
+        with self.assertRaises(EngineError):
+            engine.get_move(GameState(Grid()))
+        self.assertEqual(engine.metrics.errors, 2)
+
+    def test_error_response(self):
+        engine = self.stub(reply({"error": "Invalid position"}))
+        with self.assertRaisesRegex(EngineError, "Invalid position"):
+            engine.get_move(GameState(Grid()))
+
+    def test_wrong_number_of_moves(self):
+        engine = self.stub(reply({"moves": [0, 1]}))
+        with self.assertRaisesRegex(EngineError, "Malformed response"):
+            engine.get_move(GameState(Grid()))
+
+    def test_illegal_answers(self):
+        for index in (-1, 9, 0, "2", 1.0, True, None):
+            with self.subTest(index=index):
+                engine = self.stub(reply({"moves": [index]}))
+                with self.assertRaisesRegex(EngineError, "Illegal move"):
+                    engine.get_move(GameState(Grid("X   O    ")))
+
+    def test_finished_game_must_get_null(self):
+        engine = self.stub(reply({"moves": [5]}))
+        with self.assertRaisesRegex(EngineError, "Illegal move"):
+            engine.get_move(GameState(Grid("XXXOO    ")))
+
+    def test_concurrent_positions_share_a_request(self):
+        engine = self.stub(answer)
+        engine.max_batch = 8
+        engine.max_delay = 5.0
+        with ThreadPoolExecutor(8) as executor:
+            moves = list(executor.map(engine.get_move, [GameState(Grid())] * 8))
+        self.assertEqual([move.cell_index for move in moves], [0] * 8)
+        self.assertEqual(engine.metrics.requests, 1)
+        self.assertEqual(engine.metrics.positions, 8)
+
+    def test_batches_are_capped(self):
+        engine = self.stub(answer)
+        engine.max_batch = 4
+        engine.max_delay = 5.0
+        with ThreadPoolExecutor(8) as executor:
+            moves = list(executor.map(engine.get_move, [GameState(Grid())] * 8))
+        self.assertEqual(len(moves), 8)
+        self.assertEqual(engine.metrics.requests, 2)
+        self.assertEqual(engine.metrics.batch_size.max, 4)
+
+    def test_lone_caller_is_not_delayed(self):
+        engine = self.stub(answer)
+        start = time.perf_counter()
+        engine.get_move(GameState(Grid()))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(engine.metrics.positions, 1)
+
+class TestSocketServer(unittest.TestCase):
+    def setUp(self):
+        self.server = socket_server(minimax.find_best_move, port=0)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+
+    def connect(self) -> RemoteEngine:
+        engine = RemoteEngine.connect(*self.server.server_address, timeout=10.0)
+        self.addCleanup(engine.close)
+        return engine
+
+    """
+    the clients' searches share the module-level caches, which are kept
+    small here, while switching threads as often as possible
+    """
+    def test_concurrent_clients(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        for cache in (game_state_pool, minimax.transposition_table):
+            self.addCleanup(setattr, cache, "maxsize", cache.maxsize)
+            cache.maxsize = 200
+        engines = [self.connect() for _ in range(4)]
+        positions = [GameState(Grid(cells)) for cells in ("X        ", "XO       ")]
+
+        def ask(engine: RemoteEngine) -> list[int | None]:
+            return engine.request(positions)
+
+        with ThreadPoolExecutor(4) as executor:
+            answers = list(executor.map(ask, engines))
+        expected = [minimax.find_best_move(p).cell_index for p in positions]
+        self.assertEqual(answers, [expected] * 4)
+        self.assertTrue(all(engine.metrics.errors == 0 for engine in engines))
+
+class TestSubprocessPlayer(unittest.TestCase):
+    def test_falls_back_to_a_random_move_on_timeout(self):
+        stub = StubEngine(lambda request, writer: None)
+        stub.engine.timeout = 0.1
+        with SubprocessPlayer(Mark("X"), 0, engine=stub.engine) as player:
+            move = player.get_move(GameState(Grid()))
+        self.assertIsNotNone(move)
+        self.assertFalse(player.owns_engine)
+        stub.engine.close()
+
+    def test_falls_back_to_a_random_move_on_an_error(self):
+        stub = StubEngine(reply({"error": "Invalid position"}))
+        with SubprocessPlayer(Mark("X"), 0, engine=stub.engine) as player:
+            move = player.get_move(GameState(Grid()))
+        self.assertIsNotNone(move)
+        stub.engine.close()
+
+    def test_error_without_fallback(self):
+        stub = StubEngine(reply({"error": "Invalid position"}))
+        player = SubprocessPlayer(Mark("X"), 0, engine=stub.engine, fallback=False)
+        with self.assertRaisesRegex(EngineError, "Invalid position"):
+            player.get_move(GameState(Grid()))
+        stub.engine.close()
+
+    def test_timeout_without_fallback(self):
+        stub = StubEngine(lambda request, writer: None)
+        stub.engine.timeout = 0.1
+        player = SubprocessPlayer(Mark("X"), 0, engine=stub.engine, fallback=False)
+        with self.assertRaises(EngineTimeout):
+            player.get_move(GameState(Grid()))
+        stub.engine.close()
+
+    def test_close_stops_the_spawned_engine(self):
+        with SubprocessPlayer(Mark("X"), 0) as player:
+            move = player.get_move(GameState(Grid("XX OO    ")))
+            self.assertEqual(move.cell_index, 2)
+        self.assertIsNotNone(player.engine.process.poll())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from tic_tac_toe.logic import solved_table
+from tic_tac_toe.logic.analysis import negamax, step
+from tic_tac_toe.logic.models import CLASSIC, Mark
+from tic_tac_toe.logic.retrograde import Solution, solve
+from tic_tac_toe.logic.solved_table import legal_game_states
+
+class TestRetrograde(unittest.TestCase):
+    def test_agrees_with_search_on_every_reachable_state(self):
+        reachable = 0
+        for starting_mark in Mark:
+            table = solve(starting_mark=starting_mark)
+            game_states = legal_game_states(starting_mark)
+            self.assertEqual(len(table), len(game_states))
+            reachable += len(game_states)
+            for game_state in game_states:
+                # the outcome from minimax, the distance from the negamax analysis
+                score = solved_table.solve(game_state).score
+                value = negamax(game_state)
+                if value:
+                    depth = CLASSIC.size + 1 - abs(value)
+                else:
+                    depth = game_state.grid.empty_count
+                self.assertEqual(
+                    table.lookup(game_state), Solution(score, depth), game_state
+                )
+                self.assertEqual(
+                    table.best_moves(game_state),
+                    tuple(
+                        move.cell_index
+                        for move in game_state.possible_moves
+                        if -step(negamax(move.after_state)) == value
+                    ),
+                    game_state,
+                )
+        self.assertEqual(reachable, 10_956)
+
+if __name__ == "__main__":
+    unittest.main()
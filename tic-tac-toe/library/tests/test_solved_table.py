@@ -0,0 +1,82 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tic_tac_toe.logic import solved_table
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.solved_table import (
+    HEADER,
+    NUM_POSITIONS,
+    RECORD,
+    SolvedTable,
+    build_table,
+    cache_directory,
+)
+
+class TestBuildTable(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_build_into_a_new_directory(self):
+        path = build_table(self.directory / "nested" / "table.bin")
+        self.assertEqual(path, self.directory / "nested" / "table.bin")
+        self.assertEqual(path.stat().st_size, HEADER.size + NUM_POSITIONS * RECORD.size)
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o644)
+        self.assertEqual(os.listdir(path.parent), ["table.bin"])
+        with SolvedTable(path) as table:
+            self.assertEqual(table.lookup(GameState(Grid())).score, 0)
+            entry = table.lookup(GameState(Grid("XX OO    "), Mark.CROSS))
+            self.assertEqual(entry, (1, (2,)))
+
+    def test_failed_build_leaves_no_partial_file(self):
+        path = self.directory / "table.bin"
+        # nothing to solve, since only the way the file is written matters here
+        with (
+            patch.object(solved_table, "legal_game_states", return_value=[]),
+            patch("os.replace", side_effect=OSError("disk full")),
+        ):
+            with self.assertRaisesRegex(OSError, "disk full"):
+                build_table(path)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_failed_build_keeps_the_previous_table(self):
+        path = self.directory / "table.bin"
+        path.write_bytes(b"previous")
+        with (
+            patch.object(solved_table, "legal_game_states", return_value=[]),
+            patch("os.replace", side_effect=OSError("disk full")),
+        ):
+            with self.assertRaises(OSError):
+                build_table(path)
+        self.assertEqual(os.listdir(self.directory), ["table.bin"])
+        self.assertEqual(path.read_bytes(), b"previous")
+
+class TestCacheDirectory(unittest.TestCase):
+    def test_xdg_cache_home(self):
+        with (
+            patch("sys.platform", "linux"),
+            patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/cache"}),
+        ):
+            self.assertEqual(cache_directory(), Path("/tmp/cache") / "tic-tac-toe")
+
+    def test_home_directory(self):
+        with patch("sys.platform", "linux"), patch.dict(os.environ):
+            os.environ.pop("XDG_CACHE_HOME", None)
+            self.assertEqual(
+                cache_directory(), Path.home() / ".cache" / "tic-tac-toe"
+            )
+
+    def test_windows(self):
+        with (
+            patch("sys.platform", "win32"),
+            patch.dict(os.environ, {"LOCALAPPDATA": "/tmp/local"}),
+        ):
+            self.assertEqual(cache_directory(), Path("/tmp/local") / "tic-tac-toe")
+
+if __name__ == "__main__":
+    unittest.main()
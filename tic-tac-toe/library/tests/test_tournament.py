@@ -0,0 +1,54 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.tournament import Tournament
+
+PLAYERS = {"a": RandomComputerPlayer, "b": RandomComputerPlayer}
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "checkpoint.jsonl"
+
+    def tournament(self, players: dict = PLAYERS) -> Tournament:
+        return Tournament(players, games=8, workers=1, seed=1, checkpoint=self.path)
+
+    def test_resume(self):
+        first = self.tournament().run()
+        second = self.tournament().run()
+        self.assertEqual(second.resumed_games, 8)
+        self.assertEqual(second.played_games, 0)
+        self.assertEqual(second.pairings, first.pairings)
+
+    def test_partial_last_line_is_dropped(self):
+        players = PLAYERS | {"c": RandomComputerPlayer}
+        self.tournament(players).run()
+        lines = self.path.read_text(encoding="utf-8").splitlines(keepends=True)
+        # as if the run was killed while writing the last pairing
+        self.path.write_text("".join(lines[:-1]) + lines[-1][:20], encoding="utf-8")
+        result = self.tournament(players).run()
+        self.assertEqual(result.resumed_games, 16)
+        self.assertEqual(result.played_games, 8)
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 4)
+        for line in lines:
+            json.loads(line)
+
+    def test_partial_header(self):
+        self.path.write_text('{"tournam', encoding="utf-8")
+        result = self.tournament().run()
+        self.assertEqual(result.played_games, 8)
+        self.assertEqual(self.tournament().run().resumed_games, 8)
+
+    def test_different_tournament(self):
+        self.tournament().run()
+        other = Tournament(PLAYERS, games=4, workers=1, checkpoint=self.path)
+        with self.assertRaisesRegex(ValueError, "different tournament"):
+            other.run()
+
+if __name__ == "__main__":
+    unittest.main()
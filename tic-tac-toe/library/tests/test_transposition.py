@@ -0,0 +1,86 @@
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tic_tac_toe.logic import minimax
+from tic_tac_toe.logic.models import (
+    GameState,
+    GameStatePool,
+    Grid,
+    Mark,
+    game_state_pool,
+)
+from tic_tac_toe.logic.transposition import CacheInfo, TranspositionTable
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_evicts_the_least_recently_used_entry(self):
+        table = TranspositionTable(maxsize=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        self.assertEqual(table.get("a"), 1)
+        table.put("c", 3)
+        self.assertIsNone(table.get("b"))
+        self.assertEqual(table.get("c"), 3)
+        self.assertEqual(table.cache_info(), CacheInfo(2, 1, 2, 2))
+        self.assertAlmostEqual(table.hit_rate, 2 / 3)
+
+    def test_shrinking_evicts_and_clear_resets(self):
+        table = TranspositionTable(maxsize=None)
+        for score, key in enumerate("abcde"):
+            table.put(key, score)
+        table.maxsize = 2
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.get("e"), 4)
+        table.clear()
+        self.assertEqual(table.cache_info(), CacheInfo(0, 0, 2, 0))
+
+    def test_negative_size(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(maxsize=-1)
+        with self.assertRaises(ValueError):
+            TranspositionTable().maxsize = -1
+
+class TestGameStatePool(unittest.TestCase):
+    def test_interns_game_states(self):
+        pool = GameStatePool(maxsize=2)
+        game_state = pool.get("X        ", Mark("X"))
+        self.assertIs(pool.get("X        ", Mark("X")), game_state)
+        self.assertIsNot(pool.get("X        ", Mark("O")), game_state)
+        self.assertEqual(game_state.grid, Grid("X        "))
+        pool.get("XO       ", Mark("X"))
+        self.assertIsNot(pool.get("X        ", Mark("X")), game_state)
+        self.assertEqual(pool.cache_info(), CacheInfo(1, 4, 2, 2))
+
+    def test_zero_size_turns_interning_off(self):
+        pool = GameStatePool(maxsize=0)
+        game_state = pool.get("X        ", Mark("X"))
+        self.assertIsNot(pool.get("X        ", Mark("X")), game_state)
+        self.assertEqual(len(pool), 0)
+
+"""
+Switching threads as often as possible makes a search lose the race for
+an entry between looking it up and moving it within the cache, to one
+that evicts the entry, which small caches make a lot more likely.
+"""
+class TestThreads(unittest.TestCase):
+    def setUp(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+    def test_concurrent_searches_share_the_caches(self):
+        pool_size = game_state_pool.maxsize
+        table_size = minimax.transposition_table.maxsize
+        game_state_pool.maxsize = minimax.transposition_table.maxsize = 200
+        self.addCleanup(setattr, game_state_pool, "maxsize", pool_size)
+        self.addCleanup(setattr, minimax.transposition_table, "maxsize", table_size)
+        game_state = GameState(Grid("X        "))
+        with ThreadPoolExecutor(8) as executor:
+            moves = list(
+                executor.map(lambda _: minimax.find_best_move(game_state), range(8))
+            )
+        expected = minimax.find_best_move(game_state).cell_index
+        self.assertEqual([move.cell_index for move in moves], [expected] * 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.solved_table import legal_game_states
+
+# NumPy is an optional dependency
+try:
+    from tic_tac_toe.logic import vectorized
+except ImportError:
+    vectorized = None
+
+@unittest.skipIf(vectorized is None, "requires NumPy")
+class TestEvaluate(unittest.TestCase):
+    def test_agrees_with_game_state_on_every_reachable_state(self):
+        game_states = legal_game_states(Mark.CROSS) + legal_game_states(Mark.NAUGHT)
+        self.assertEqual(len(game_states), 10_956)
+        boards = vectorized.from_cells(
+            game_state.grid.cells for game_state in game_states
+        )
+        starting = [
+            vectorized.MARK_CODES[game_state.starting_mark]
+            for game_state in game_states
+        ]
+        result = vectorized.evaluate(boards, starting)
+        self.assertEqual(
+            vectorized.to_cells(boards),
+            [game_state.grid.cells for game_state in game_states],
+        )
+        for i, game_state in enumerate(game_states):
+            winner = game_state.winner
+            self.assertEqual(
+                (
+                    int(result.winner[i]),
+                    bool(result.tie[i]),
+                    bool(result.game_over[i]),
+                    int(result.current_mark[i]),
+                    set(result.legal_moves[i].nonzero()[0].tolist()),
+                    set(result.winning_cells[i].nonzero()[0].tolist()),
+                ),
+                (
+                    vectorized.MARK_CODES[winner] if winner else vectorized.EMPTY,
+                    game_state.tie,
+                    game_state.game_over,
+                    vectorized.MARK_CODES[game_state.current_mark],
+                    {move.cell_index for move in game_state.possible_moves},
+                    set(game_state.winning_cells),
+                ),
+                game_state,
+            )
+
+    def test_bitboards_round_trip(self):
+        game_states = legal_game_states()
+        boards = vectorized.from_cells(
+            game_state.grid.cells for game_state in game_states
+        )
+        crosses, naughts = vectorized.to_bitboards(boards)
+        self.assertEqual(
+            list(zip(crosses.tolist(), naughts.tolist())),
+            [
+                (game_state.grid.bitboard.crosses, game_state.grid.bitboard.naughts)
+                for game_state in game_states
+            ],
+        )
+        self.assertTrue(
+            (vectorized.from_bitboards(crosses, naughts) == boards).all()
+        )
+
+if __name__ == "__main__":
+    unittest.main()